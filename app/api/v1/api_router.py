@@ -3,12 +3,18 @@
 from fastapi import APIRouter
 from .endpoints.health import router as health_router
 from .endpoints.hotspots import router as hotspots_router
+from .endpoints.ai import router as ai_router
+from .endpoints.ocr import router as ocr_router
+from .endpoints.admin import router as admin_router
 # 새로 만든 추천 시스템 라우터 추가
-from .endpoints.recommend import router as recommend_router
+from .endpoints.recomand import router as recommend_router
 
 router = APIRouter()
 router.include_router(health_router, tags=["core"])
 router.include_router(hotspots_router, prefix="/hotspots", tags=["hotspots"])
+router.include_router(ai_router, tags=["ai"])
+router.include_router(ocr_router, prefix="/ocr", tags=["ocr"])
+router.include_router(admin_router, prefix="/admin", tags=["admin"])
 
 # 추천 시스템 엔드포인트를 위한 라우터 추가
 router.include_router(recommend_router, prefix="/recommend", tags=["recommendation"])
\ No newline at end of file
@@ -0,0 +1,37 @@
+# app/api/v1/endpoints/admin.py
+
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from typing import Dict, Any
+from ....core.dependencies import require_admin
+from ....services.model_service import LSTMForecastService, ModelSwapInProgress, ModelVersionPinned
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+lstm = LSTMForecastService()
+
+class ModelSwapInput(BaseModel):
+    version: str
+
+@router.get("/model", response_model=Dict[str, Any])
+async def get_model_status():
+    """
+    현재 활성 모델 버전, 사용 가능한 버전 목록, 교체 진행 여부 (이 워커 프로세스 기준)
+    """
+    return lstm.status()
+
+@router.post("/model/swap", response_model=Dict[str, Any])
+async def swap_model(input: ModelSwapInput):
+    """
+    모델 무중단 교체
+    - 새 버전을 백그라운드 스레드에서 로드·워밍업한 뒤 active 포인터만 교체 (진행 중인 추론은 기존 버전으로 완료)
+    - ACTIVE 파일을 갱신하므로 다른 워커 프로세스도 MODEL_WATCH_INTERVAL_S 내에 같은 버전으로 교체됨
+    - 교체 진행 중이거나 MODEL_VERSION 으로 버전이 고정되어 있으면 409
+    """
+    try:
+        result = await asyncio.to_thread(lstm.swap, input.version)
+    except (ModelSwapInProgress, ModelVersionPinned) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {**result, **lstm.status()}
@@ -1,9 +1,13 @@
 # app/api/v1/endpoints/ai.py
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Dict, Any
-from ...services.llm_service import LLMService
+from typing import Dict, Any, Optional
+from ....core.config import settings
+from ....schemas.job import CallbackUrl, JobSubmitted, JobStatus
+from ....schemas.promotion import PromotionRequest
+from ....services.job_queue import job_queue
+from ....services.llm_service import LLMService
 
 router = APIRouter()
 llm_service = LLMService()
@@ -18,23 +22,67 @@ class AiCampaignInput(BaseModel):
     store_name: str
     event_type: str
     details: str
+    callback_url: Optional[CallbackUrl] = None  # 완료 시 결과를 POST 받을 URL (JOB_CALLBACK_ALLOWED_HOSTS)
+
+class PromotionJobInput(PromotionRequest):
+    callback_url: Optional[CallbackUrl] = None
+
+
+# ---------- 작업 큐 핸들러 (LLM 생성은 요청 밖에서 실행) ----------
+async def _run_campaign(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return await llm_service.generate_campaign(
+        payload["store_name"], payload["event_type"], payload["details"]
+    )
+
+async def _run_promotion(payload: Dict[str, Any]) -> Dict[str, Any]:
+    promotion = await llm_service.generate_promotion(payload["store_name"], payload["description"])
+    return promotion.model_dump()
+
+job_queue.register("campaign", _run_campaign)
+job_queue.register("promotion", _run_promotion)
+
+
+def _callback(url: Optional[CallbackUrl]) -> Optional[str]:
+    return str(url) if url is not None else None
+
+def _submitted(job: Dict[str, Any]) -> JobSubmitted:
+    return JobSubmitted(**job, poll_url=f"{settings.API_V1_STR}/ai/jobs/{job['job_id']}")
+
 
 @router.post("/ai/explain", response_model=Dict[str, Any])
 async def explain_forecast(input: ForecastInput):
     """
     예측 결과에 대한 LLM 요약, 이유, 액션 제안 (JSON)
     """
-    explanation = llm_service.generate_explanation(
+    explanation = await llm_service.generate_explanation(
         input.cell_id, input.target_month, input.lift, input.score
     )
     return explanation
 
-@router.post("/ai/generate-campaign", response_model=Dict[str, Any])
+@router.post("/ai/generate-campaign", response_model=JobSubmitted, status_code=202)
 async def generate_campaign(input: AiCampaignInput):
     """
-    AI 기반 홍보 카피 및 포스터 생성
+    AI 기반 홍보 카피 및 포스터 생성 작업 제출
+    - 즉시 job_id 반환, 결과는 GET /ai/jobs/{job_id} 로 조회 (또는 callback_url 로 수신)
+    - 같은 입력의 작업이 대기/실행 중이면 기존 job_id 반환
     """
-    campaign_content = llm_service.generate_campaign(
-        input.store_name, input.event_type, input.details
-    )
-    return campaign_content
\ No newline at end of file
+    job = await job_queue.submit("campaign", input.model_dump(exclude={"callback_url"}), _callback(input.callback_url))
+    return _submitted(job)
+
+@router.post("/ai/generate-promotion", response_model=JobSubmitted, status_code=202)
+async def generate_promotion(input: PromotionJobInput):
+    """
+    가게 홍보 문구 생성 작업 제출 (generate-campaign 과 동일한 방식)
+    """
+    job = await job_queue.submit("promotion", input.model_dump(exclude={"callback_url"}), _callback(input.callback_url))
+    return _submitted(job)
+
+@router.get("/ai/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """
+    작업 상태/결과 조회. 없거나 보관 기간(TTL)이 지난 작업은 404
+    """
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
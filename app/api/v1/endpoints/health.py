@@ -1,10 +1,22 @@
 # app/api/v1/endpoints/health.py
 
 from fastapi import APIRouter
+from ....services.upstream_scheduler import scheduler
+from ....services.job_queue import job_queue
 
 router = APIRouter()
 
 @router.get("/healthz")
 def health_check():
     """API 서버 상태 확인"""
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+@router.get("/healthz/upstreams")
+def upstream_stats():
+    """외부 API 별 대기열 길이, 처리 중 호출 수, 거절(shed) 횟수 (현재 워커 프로세스 기준)"""
+    return scheduler.stats()
+
+@router.get("/healthz/jobs")
+async def job_stats():
+    """백그라운드 작업 큐 상태별 작업 수"""
+    return await job_queue.stats()
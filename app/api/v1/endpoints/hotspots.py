@@ -1,22 +1,27 @@
 # app/api/v1/endpoints/hotspots.py
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
 from typing import List, Dict, Any
 from pathlib import Path
 import json
+import logging
 
 from ....schemas.hotspot import HotspotGeoJSON, HotspotFeature
 from ....services.map_service import MapService
 from ....services.model_service import LSTMForecastService
 
+log = logging.getLogger(__name__)
 router = APIRouter()
 map_service = MapService()
 lstm = LSTMForecastService()
 
 
 DUMMY_PATH = Path(__file__).resolve().parents[4] / "data" / "dummy_hotspots.json"
+# 더미 폴백 응답 표시 (상태 코드는 200 그대로라 클라이언트/벤치마크가 실제 예측과 구분할 수 있게)
+FALLBACK_HEADER = "X-Hotspots-Fallback"
 
 @router.get("/next-month", response_model=HotspotGeoJSON)
 async def get_next_month_hotspots(
+    response: Response,
     lat: float = Query(..., description="위도"),
     lng: float = Query(..., description="경도"),
     radius_km: float = Query(5.0, description="반경 (km)")
@@ -25,15 +30,21 @@ async def get_next_month_hotspots(
         # 1) 주변 셀
         cell_ids = map_service.get_nearby_cells(lat, lng, radius_km)
 
+        # 요청 동안 같은 모델 버전을 사용 (도중에 교체되어도 이 요청은 기존 버전으로 끝까지)
+        model = lstm.active
+        week = map_service.latest_week()
         feats: List[Dict[str, Any]] = []
         for cid in cell_ids:
-            # 2) 최근 seq_len주 feature 로드 (네가 구현한 데이터 소스에 맞춤)
-            last_rows = map_service.load_cell_features_last_weeks(cid, weeks=lstm.seq_len)
-            if not last_rows or len(last_rows) < lstm.seq_len:
-                continue
+            # 2) 주간 갱신(refresh_forecasts)으로 계산해 둔 예측이 있으면 사용
+            y_preds = model.cached_forecast(cid, week)
+            if y_preds is None:
+                # 최근 seq_len주 feature 로드 (네가 구현한 데이터 소스에 맞춤)
+                last_rows = map_service.load_cell_features_last_weeks(cid, weeks=model.seq_len)
+                if not last_rows or len(last_rows) < model.seq_len:
+                    continue
 
-            # 3) 예측
-            y_preds = lstm.forecast(last_rows)  # 길이 out_len
+                # 3) 예측
+                y_preds = model.forecast(last_rows)  # 길이 out_len
             score = float(sum(y_preds) / len(y_preds))
 
             polygon = map_service.get_cell_polygon(cid)      # [[lng,lat], ...]
@@ -58,9 +69,10 @@ async def get_next_month_hotspots(
         return HotspotGeoJSON(type="FeatureCollection",
                               features=[HotspotFeature(**f) for f in feats])
 
-    except Exception:
+    except Exception as e:
         # 실패 시 더미로 폴백
         log.exception(f"hotspots next-month failed: {e}")
+        response.headers[FALLBACK_HEADER] = "dummy"
         with DUMMY_PATH.open("r", encoding="utf-8") as f:
             data = json.load(f)
         return HotspotGeoJSON(
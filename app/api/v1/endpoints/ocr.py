@@ -13,7 +13,7 @@ async def authenticate_receipt_with_ocr(file: UploadFile = File(...)):
     file_content = await file.read()
     
     # 1. OCR 서비스로 이미지 텍스트 추출
-    extracted_text = ocr_service.process_receipt_image(file_content)
+    extracted_text = await ocr_service.process_receipt_image(file_content)
 
     # 2. 추출된 텍스트로 가게 정보 검증 (데이터베이스 연동 가정)
     known_stores = ["스타벅스", "파리바게뜨", "교촌치킨"] 
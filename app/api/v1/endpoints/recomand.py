@@ -1,13 +1,19 @@
 # app/api/endpoints/recommend.py
 
+import os
 from fastapi import APIRouter, HTTPException
 from app.schemas.recommendation_schema import RecommendRequest, RecommendationPayload
-from app.services.recommendation_service import provider_search_places, provider_get_weather, call_gemini_json
+from app.services.recommendation_service import provider_search_places, provider_get_weather, call_gemini_json, generate_gemini
+from app.core.config import settings
+from app.services.upstream_scheduler import request_deadline
 
 router = APIRouter()
 
+# /recommend 전체 처리 마감 시간(초). upstream 대기 예상이 이를 넘으면 즉시 503
+RECOMMEND_DEADLINE_S = settings.RECOMMEND_DEADLINE_S
+
 # 임시: LLM 완전 모의 응답 (for UX testing)
-FORCE_MOCK_LLM = False
+FORCE_MOCK_LLM = os.getenv("FORCE_MOCK_LLM", "0") == "1"
 MOCK_RESPONSE = {
     "summary": "샘플 추천 결과",
     "recommendations": [
@@ -23,26 +29,26 @@ async def recommend(req: RecommendRequest, debug: bool = False):
     """
     이 엔드포인트는 사용자의 프로필과 현재 맥락에 기반하여 장소를 추천하고 미션을 생성합니다.
     """
-    try:
-        # provider의 정상 동작 여부를 사전 확인합니다.
-        _ = await provider_search_places(req.context.category, req.context.lat, req.context.lng, req.context.radius_m)
-        _ = await provider_get_weather(req.context.lat, req.context.lng, req.context.when)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Provider Error: {e}")
+    with request_deadline(RECOMMEND_DEADLINE_S):
+        try:
+            # provider 호출은 요청당 1회만 (upstream quota 절약)
+            cands = await provider_search_places(req.context.category, req.context.lat, req.context.lng, req.context.radius_m)
+            wx = await provider_get_weather(req.context.lat, req.context.lng, req.context.when)
+        except HTTPException:
+            # 스케줄러의 503(load shedding)은 그대로 전달
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Provider Error: {e}")
 
-    if debug:
-        # 디버그 모드일 경우 LLM을 우회하고 후보 장소만 반환합니다.
-        cands = await provider_search_places(req.context.category, req.context.lat, req.context.lng, req.context.radius_m)
-        wx = await provider_get_weather(req.context.lat, req.context.lng, req.context.when)
-        return {"summary":"debug bypass","recommendations":[],"missions":[],"_debug":{"candidates_len":len(cands),"weather":wx}}
+        if debug:
+            # 디버그 모드일 경우 LLM을 우회하고 후보 장소만 반환합니다.
+            return {"summary":"debug bypass","recommendations":[],"missions":[],"_debug":{"candidates_len":len(cands),"weather":wx}}
 
-    if FORCE_MOCK_LLM:
-        return MOCK_RESPONSE
+        if FORCE_MOCK_LLM:
+            return MOCK_RESPONSE
 
-    # 정상 경로: 후보 장소 및 날씨 정보를 수집하여 Gemini에 전달합니다.
-    cands = await provider_search_places(req.context.category, req.context.lat, req.context.lng, req.context.radius_m)
-    wx = await provider_get_weather(req.context.lat, req.context.lng, req.context.when)
-    return await call_gemini_json(req.user_profile.model_dump(), req.context.model_dump(), cands, wx)
+        # 정상 경로: 후보 장소 및 날씨 정보를 수집하여 Gemini에 전달합니다.
+        return await call_gemini_json(req.user_profile.model_dump(), req.context.model_dump(), cands, wx)
 
 @router.get("/selftest/gemini")
 async def selftest_gemini():
@@ -60,10 +66,14 @@ async def selftest_gemini():
     try:
         genai.configure(api_key=GEMINI_API_KEY)
         model = genai.GenerativeModel(GEMINI_MODEL)
-        r = await model.generate_content_async(
+        # 셀프 테스트도 Gemini 한도 안에서 호출 (429/대기열 포화는 503 그대로 전달)
+        r = await generate_gemini(
+            model,
             "Return a one-line JSON object {\"ok\": true}.",
             generation_config={"response_mime_type": "application/json"},
         )
         return {"ok": True, "model": GEMINI_MODEL, "sample": json.loads(r.text)}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gemini selftest failed: {e}")
\ No newline at end of file
@@ -0,0 +1,12 @@
+# app/core/dependencies.py
+import hmac
+from typing import Optional
+from fastapi import Header, HTTPException
+from .config import settings
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """관리자 API 인증: X-Admin-Token 헤더가 ADMIN_TOKEN 과 일치해야 함 (미설정 시 비활성화)"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="관리자 API가 비활성화되어 있습니다. (ADMIN_TOKEN 미설정)")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="관리자 토큰이 올바르지 않습니다.")
@@ -0,0 +1,45 @@
+# app/core/serving.py
+"""
+운영 서빙(pre-fork) 보조 함수
+- 마스터 프로세스: 모델/격자 데이터를 fork 전에 1회 로드하고 gc.freeze() 로 고정
+  → 워커들이 copy-on-write 로 같은 메모리 페이지를 공유
+- 워커 프로세스: fork 직후 torch 스레드 수를 제한 (워커 수 x 코어 수 과구독 방지)
+"""
+from __future__ import annotations
+
+import gc
+import logging
+
+from .config import settings
+
+log = logging.getLogger(__name__)
+
+
+def preload_shared_state() -> None:
+    """fork 전에 마스터에서 호출. 공유할 객체를 모두 만든 뒤 GC 대상에서 제외한다."""
+    from ..services.model_service import LSTMForecastService
+    from ..services.map_service import get_grid
+
+    svc = LSTMForecastService()
+    if svc.supports_incremental:
+        svc.cell_state  # 주간 갱신 상태 캐시도 공유
+    try:
+        get_grid().touch()
+    except FileNotFoundError as e:
+        log.warning("grid data not preloaded: %s", e)
+
+    # 이후 워커에서 GC 가 공유 객체 헤더를 건드려 페이지가 복사되지 않도록 고정
+    gc.collect()
+    gc.freeze()
+
+
+def configure_worker_threads(num_threads: int = settings.TORCH_NUM_THREADS) -> None:
+    """fork 직후 워커에서 호출. 워커당 torch 연산 스레드 상한 설정"""
+    import torch
+
+    torch.set_num_threads(max(1, num_threads))
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # 이미 병렬 연산이 시작된 프로세스에서는 변경 불가
+        pass
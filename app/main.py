@@ -1,9 +1,25 @@
 # app/main.py
+import asyncio
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .api.v1.api_router import router as api_router
 from .core.config import settings
+from .services.job_queue import job_queue
+from .services.model_service import watch_active_version
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 백그라운드 작업 큐 워커 (pre-fork 모드에서는 워커 프로세스마다 시작)
+    await job_queue.start()
+    # 다른 워커가 모델을 교체하면(ACTIVE 파일 변경) 이 프로세스도 따라서 교체
+    model_watcher = asyncio.create_task(watch_active_version())
+    try:
+        yield
+    finally:
+        model_watcher.cancel()
+        await job_queue.stop()
 
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -13,6 +29,7 @@ def create_app() -> FastAPI:
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
         docs_url=f"{settings.API_V1_STR}/docs",
         redoc_url=None,
+        lifespan=lifespan,
     )
 
     # CORS
@@ -1,15 +1,17 @@
 # backend/app/schemas/hotspot.py
 
 from pydantic import BaseModel
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Optional, Union
 
 class HotspotProperties(BaseModel):
     """핫스팟의 속성 데이터 모델"""
     cell_id: str
-    target_month: str
-    lift: float
     score: float
-    reason_ai: Dict[str, str]
+    forecast: Optional[List[float]] = None
+    centroid: Optional[Dict[str, float]] = None
+    target_month: Optional[str] = None
+    lift: Optional[float] = None
+    reason_ai: Optional[Dict[str, str]] = None
 
 class HotspotFeature(BaseModel):
     """핫스팟 GeoJSON Feature 모델"""
@@ -0,0 +1,41 @@
+# app/schemas/job.py
+from pydantic import AfterValidator, BaseModel, HttpUrl
+from typing import Annotated, Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from ..core.config import settings
+
+
+def check_callback_url(url: Any) -> Any:
+    """
+    callback 대상 제한 (서버가 임의 URL 로 요청을 보내지 않도록)
+    - https 만 허용, 호스트는 JOB_CALLBACK_ALLOWED_HOSTS 에 있는 것만
+    """
+    parts = urlsplit(str(url))
+    if parts.scheme != "https":
+        raise ValueError("callback_url must use https")
+    allowed = {h.strip().lower() for h in settings.JOB_CALLBACK_ALLOWED_HOSTS.split(",") if h.strip()}
+    if (parts.hostname or "").lower() not in allowed:
+        raise ValueError("callback_url host is not allowed")
+    return url
+
+
+CallbackUrl = Annotated[HttpUrl, AfterValidator(check_callback_url)]
+
+class JobSubmitted(BaseModel):
+    """작업 제출 응답 (202)"""
+    job_id: str
+    status: str
+    deduplicated: bool = False
+    poll_url: str
+
+class JobStatus(BaseModel):
+    """작업 상태 조회 응답"""
+    job_id: str
+    kind: str
+    status: str            # pending | running | done | failed
+    attempts: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
@@ -0,0 +1,239 @@
+# app/scripts/bench_load.py
+"""
+엔드투엔드 부하/벤치마크 (성능 변경 전후 비교용 기준선)
+
+  python -m app.scripts.generate_dummy_data          # 먼저 합성 데이터 생성
+  python -m app.scripts.bench_load --spawn --concurrency 16 --duration 20
+
+시나리오
+  hotspots  GET  /api/v1/hotspots/next-month   (격자 범위 안 임의 좌표)
+  recommend POST /api/v1/recommend/recommend   (mock 장소/날씨 provider, FORCE_MOCK_LLM=1)
+  ocr       POST /api/v1/ocr/authenticate/receipt (로컬 Clova OCR 스텁 서버)
+
+--spawn 이면 합성 데이터(GRID_DATA_DIR/MODEL_DIR)와 스텁 설정으로 서버를 직접 띄우고,
+아니면 --base-url 의 서버를 그대로 사용한다 (이 경우 스텁 설정은 서버 쪽에서 맞춰야 함).
+시나리오별 처리량(req/s), 오류 수, p50/p95/p99/max 지연(ms)을 출력한다.
+hotspots 의 더미 폴백 응답(200 + X-Hotspots-Fallback)은 성공이 아니라 "fallback" 오류로 집계한다.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import signal
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from app.scripts.bench_serving import FALLBACK_HEADER, ROOT, server_cmd, wait_ready
+
+DATA_DIR = ROOT / "data"
+CATEGORIES = ["cafe", "brunch", "korean", "japanese", "dessert", "bar"]
+
+
+# ---------- Clova OCR 스텁 ----------
+def start_ocr_stub(port: int, store_names: List[str], latency_ms: float) -> ThreadingHTTPServer:
+    """Clova 영수증 응답 형식을 흉내내는 HTTP 서버 (요청마다 latency_ms 지연)"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency_ms / 1000.0)
+            name = random.choice(store_names)
+            body = json.dumps({"images": [{"receipt": {"result": {"subResults": [
+                {"items": [{"name": {"text": name}}, {"name": {"text": "아메리카노 1 4500"}}]}
+            ]}}}]}, ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ---------- 요청 생성 ----------
+def _grid_bbox(grid_dir: Path):
+    with (grid_dir / "cells.json").open("r", encoding="utf-8") as f:
+        centroids = json.load(f)["centroids"]
+    lats = [c[0] for c in centroids]
+    lngs = [c[1] for c in centroids]
+    return min(lats), max(lats), min(lngs), max(lngs)
+
+
+def make_scenarios(args) -> Dict[str, Callable[[httpx.AsyncClient], Any]]:
+    lat0, lat1, lng0, lng1 = _grid_bbox(args.data_dir / "grid")
+
+    def point():
+        return random.uniform(lat0, lat1), random.uniform(lng0, lng1)
+
+    async def hotspots(c: httpx.AsyncClient):
+        lat, lng = point()
+        return await c.get("/api/v1/hotspots/next-month",
+                           params={"lat": lat, "lng": lng, "radius_km": args.radius_km})
+
+    async def recommend(c: httpx.AsyncClient):
+        lat, lng = point()
+        return await c.post("/api/v1/recommend/recommend", json={
+            "user_profile": {"budget_level": random.randint(1, 5), "tags": ["quiet"], "allergies": []},
+            "context": {"lat": lat, "lng": lng, "category": random.choice(CATEGORIES), "radius_m": 1500},
+        })
+
+    receipts_dir = args.data_dir / "receipts"
+    images = sorted(receipts_dir.glob("*.png"))[:args.max_receipts]
+    blobs = [p.read_bytes() for p in images]
+
+    async def ocr(c: httpx.AsyncClient):
+        blob = random.choice(blobs)
+        return await c.post("/api/v1/ocr/authenticate/receipt",
+                            files={"file": ("receipt.png", blob, "image/png")})
+
+    scenarios = {"hotspots": hotspots, "recommend": recommend}
+    if blobs:
+        scenarios["ocr"] = ocr
+    return scenarios
+
+
+# ---------- 부하/집계 ----------
+def percentile(sorted_ms: List[float], p: float) -> float:
+    if not sorted_ms:
+        return float("nan")
+    k = max(0, min(len(sorted_ms) - 1, math.ceil(p / 100.0 * len(sorted_ms)) - 1))
+    return sorted_ms[k]
+
+
+async def run_scenario(base: str, fn, concurrency: int, duration: float, warmup: float) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+
+    async def worker(c: httpx.AsyncClient, stop: float, record: bool):
+        while time.monotonic() < stop:
+            t0 = time.perf_counter()
+            try:
+                r = await fn(c)
+                status = "fallback" if FALLBACK_HEADER in r.headers else str(r.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            if not record:
+                continue
+            if status == "200":
+                latencies.append((time.perf_counter() - t0) * 1000.0)
+            else:
+                errors[status] = errors.get(status, 0) + 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, timeout=60.0, limits=limits) as c:
+        if warmup > 0:
+            stop = time.monotonic() + warmup
+            await asyncio.gather(*(worker(c, stop, False) for _ in range(concurrency)))
+        started = time.monotonic()
+        stop = started + duration
+        await asyncio.gather(*(worker(c, stop, True) for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies) + sum(errors.values()),
+        "ok": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": latencies[-1] if latencies else float("nan"),
+    }
+
+
+def spawn_server(args) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        GRID_DATA_DIR=str(args.data_dir / "grid"),
+        MODEL_DIR=str(args.data_dir / "model"),
+        PROVIDER_PLACES="mock",
+        OPENWEATHER_API_KEY="",
+        FORCE_MOCK_LLM="1",
+        NAVER_OCR_API_URL=f"http://127.0.0.1:{args.ocr_stub_port}/ocr",
+        NAVER_OCR_SECRET_KEY="stub",
+        JOB_DB_PATH=str(args.data_dir / "bench_jobs.sqlite3"),
+    )
+    # 스텁 OCR 은 실제 Clova 한도가 없으므로 서버 처리량을 재도록 한도를 풀어둠 (환경 변수로 덮어쓰기 가능)
+    env.setdefault("UPSTREAM_CLOVA_RPS", "10000")
+    env.setdefault("UPSTREAM_CLOVA_BURST", "10000")
+    env.setdefault("UPSTREAM_CLOVA_CONCURRENCY", "256")
+    env.setdefault("UPSTREAM_CLOVA_QUEUE", "10000")
+    return subprocess.Popen(server_cmd(args.server, args.workers, args.port), cwd=str(ROOT), env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scenarios", nargs="+", default=["hotspots", "recommend", "ocr"])
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--duration", type=float, default=20.0)
+    ap.add_argument("--warmup", type=float, default=3.0)
+    ap.add_argument("--radius-km", type=float, default=1.0)
+    ap.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    ap.add_argument("--max-receipts", type=int, default=50)
+    ap.add_argument("--base-url", default=None)
+    ap.add_argument("--spawn", action="store_true", help="합성 데이터/스텁 설정으로 서버를 직접 실행")
+    ap.add_argument("--server", choices=["uvicorn", "prefork"], default="prefork")
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--port", type=int, default=8766)
+    ap.add_argument("--ocr-stub-port", type=int, default=8799)
+    ap.add_argument("--ocr-latency-ms", type=float, default=150.0)
+    ap.add_argument("--startup-timeout", type=float, default=120.0)
+    ap.add_argument("--json-out", type=Path, default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    random.seed(args.seed)
+
+    stub = start_ocr_stub(args.ocr_stub_port, ["스타벅스", "파리바게뜨", "교촌치킨", "이디야커피"], args.ocr_latency_ms)
+    proc: Optional[subprocess.Popen] = None
+    base = args.base_url or f"http://127.0.0.1:{args.port}"
+    try:
+        if args.spawn:
+            proc = spawn_server(args)
+        asyncio.run(wait_ready(base, args.startup_timeout))
+
+        scenarios = make_scenarios(args)
+        results: Dict[str, Any] = {}
+        for name in args.scenarios:
+            if name not in scenarios:
+                print(f"skip {name}: no input data")
+                continue
+            results[name] = asyncio.run(
+                run_scenario(base, scenarios[name], args.concurrency, args.duration, args.warmup)
+            )
+    finally:
+        if proc is not None:
+            proc.send_signal(signal.SIGTERM)
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        stub.shutdown()
+
+    print(f"concurrency={args.concurrency} duration={args.duration}s base={base}")
+    print(f"{'scenario':<10} {'req':>7} {'ok':>7} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  errors")
+    for name, r in results.items():
+        print(f"{name:<10} {r['requests']:>7} {r['ok']:>7} {r['rps']:>8.1f} {r['p50_ms']:>8.1f} "
+              f"{r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}  {r['errors'] or ''}")
+    if args.json_out:
+        args.json_out.write_text(json.dumps({"args": {k: str(v) for k, v in vars(args).items()},
+                                             "results": results}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
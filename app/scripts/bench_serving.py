@@ -0,0 +1,167 @@
+# app/scripts/bench_serving.py
+"""
+서빙 방식별 메모리/처리량 비교 벤치마크
+
+  - uvicorn : 현재 방식 (uvicorn --workers N, 워커마다 모델/데이터를 따로 로드)
+  - prefork : gunicorn -c gunicorn.conf.py (마스터에서 1회 로드 후 fork, CoW 공유)
+
+사용 예)
+  python -m app.scripts.bench_serving --workers 1 4 8 --duration 15 --concurrency 32
+
+각 조합마다 서버를 띄우고, /api/v1/hotspots/next-month 에 부하를 준 뒤 (더미 폴백 응답은 오류로 집계)
+프로세스 트리 전체의 RSS / PSS 합계와 초당 요청 수를 출력한다.
+(PSS 는 공유 페이지를 프로세스 수로 나눈 값이라 실제 메모리 사용량에 가깝다)
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[2]
+HOTSPOT_PATH = "/api/v1/hotspots/next-month"
+# hotspots 는 예측 실패 시 더미 데이터를 200 으로 돌려주므로 이 헤더가 있으면 오류로 집계
+FALLBACK_HEADER = "X-Hotspots-Fallback"
+
+
+def response_ok(r: httpx.Response) -> bool:
+    return r.status_code == 200 and FALLBACK_HEADER not in r.headers
+
+
+def server_cmd(mode: str, workers: int, port: int) -> List[str]:
+    if mode == "uvicorn":
+        return [sys.executable, "-m", "uvicorn", "app.main:app",
+                "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)]
+    return [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+            "--bind", f"127.0.0.1:{port}", "--workers", str(workers), "app.main:app"]
+
+
+def _children(pid: int) -> List[int]:
+    """/proc 을 훑어 pid 의 하위 프로세스 전체를 수집"""
+    parents: Dict[int, List[int]] = {}
+    for d in os.listdir("/proc"):
+        if not d.isdigit():
+            continue
+        try:
+            with open(f"/proc/{d}/stat", "r") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        parents.setdefault(ppid, []).append(int(d))
+    out, stack = [], [pid]
+    while stack:
+        p = stack.pop()
+        out.append(p)
+        stack.extend(parents.get(p, []))
+    return out
+
+
+def memory_kb(pid: int) -> Tuple[int, int]:
+    """프로세스 트리 전체의 (RSS, PSS) 합계 [kB]"""
+    rss = pss = 0
+    for p in _children(pid):
+        try:
+            with open(f"/proc/{p}/smaps_rollup", "r") as f:
+                for line in f:
+                    if line.startswith("Rss:"):
+                        rss += int(line.split()[1])
+                    elif line.startswith("Pss:"):
+                        pss += int(line.split()[1])
+        except OSError:
+            continue
+    return rss, pss
+
+
+async def wait_ready(base: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base, timeout=2.0) as c:
+        while time.monotonic() < deadline:
+            try:
+                if (await c.get("/api/v1/healthz")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+    raise TimeoutError(f"server at {base} did not become ready")
+
+
+async def _load(base: str, params: Dict[str, float], concurrency: int, duration: float) -> Tuple[int, int]:
+    ok = err = 0
+    stop = time.monotonic() + duration
+
+    async def worker(c: httpx.AsyncClient):
+        nonlocal ok, err
+        while time.monotonic() < stop:
+            try:
+                r = await c.get(HOTSPOT_PATH, params=params)
+                if response_ok(r):
+                    ok += 1
+                else:
+                    err += 1
+            except httpx.HTTPError:
+                err += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, timeout=30.0, limits=limits) as c:
+        await asyncio.gather(*(worker(c) for _ in range(concurrency)))
+    return ok, err
+
+
+def run_one(mode: str, workers: int, args) -> Dict[str, float]:
+    port = args.port
+    base = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, TORCH_NUM_THREADS=str(args.torch_threads))
+    proc = subprocess.Popen(server_cmd(mode, workers, port), cwd=str(ROOT), env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        asyncio.run(wait_ready(base, args.startup_timeout))
+        params = {"lat": args.lat, "lng": args.lng, "radius_km": args.radius_km}
+        asyncio.run(_load(base, params, args.concurrency, 2.0))  # warm-up
+        idle_rss, idle_pss = memory_kb(proc.pid)
+        ok, err = asyncio.run(_load(base, params, args.concurrency, args.duration))
+        rss, pss = memory_kb(proc.pid)
+        return {
+            "mode": mode, "workers": workers,
+            "rss_mb": rss / 1024, "pss_mb": pss / 1024,
+            "idle_pss_mb": idle_pss / 1024,
+            "rps": ok / args.duration, "errors": err,
+        }
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--modes", nargs="+", default=["uvicorn", "prefork"], choices=["uvicorn", "prefork"])
+    ap.add_argument("--workers", nargs="+", type=int, default=[1, 4, 8])
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--duration", type=float, default=15.0)
+    ap.add_argument("--torch-threads", type=int, default=1)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--startup-timeout", type=float, default=120.0)
+    ap.add_argument("--lat", type=float, default=36.6424)
+    ap.add_argument("--lng", type=float, default=127.4890)
+    ap.add_argument("--radius-km", type=float, default=3.0)
+    args = ap.parse_args()
+
+    rows = [run_one(m, w, args) for w in args.workers for m in args.modes]
+    print(f"{'mode':<8} {'workers':>7} {'RSS(MB)':>9} {'PSS(MB)':>9} {'idlePSS':>9} {'req/s':>8} {'err':>5}")
+    for r in rows:
+        print(f"{r['mode']:<8} {r['workers']:>7} {r['rss_mb']:>9.1f} {r['pss_mb']:>9.1f} "
+              f"{r['idle_pss_mb']:>9.1f} {r['rps']:>8.1f} {r['errors']:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# app/scripts/bench_swap.py
+"""
+모델 교체 중 지연 벤치마크
+
+  python -m app.scripts.generate_dummy_data --model-versions 2
+  python -m app.scripts.bench_swap --spawn --workers 4 --duration 30 --to v2
+
+/hotspots/next-month 에 계속 부하를 주면서 duration 의 1/3 지점에 --to 버전으로,
+2/3 지점에 원래 버전으로 POST /admin/model/swap 을 호출한다.
+교체 구간(교체 요청 시작 ~ 응답 + 다른 워커 동기화 주기)과 나머지 구간의
+p50/p99/max 지연과 오류 수를 비교해 교체가 진행 중인 요청을 막지 않는지 확인한다.
+예측 실패로 더미 데이터가 나간 응답(X-Hotspots-Fallback)도 오류로 센다.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import signal
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.scripts.bench_load import DATA_DIR, make_scenarios, percentile, spawn_server
+from app.scripts.bench_serving import response_ok, wait_ready
+
+
+def _summary(latencies: List[float], errors: int) -> Dict[str, Any]:
+    latencies = sorted(latencies)
+    return {"ok": len(latencies), "errors": errors,
+            "p50_ms": percentile(latencies, 50), "p99_ms": percentile(latencies, 99),
+            "max_ms": latencies[-1] if latencies else float("nan")}
+
+
+async def run(args) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    hotspots = make_scenarios(args)["hotspots"]
+    headers = {"X-Admin-Token": args.admin_token}
+    samples: List[Tuple[float, float, bool]] = []   # (시작 시각, 지연 ms, 성공 여부)
+    windows: List[Tuple[float, float]] = []
+    swaps: List[Dict[str, Any]] = []
+    started = time.monotonic()
+    stop = started + args.duration
+
+    async def load(c: httpx.AsyncClient):
+        while time.monotonic() < stop:
+            t0 = time.monotonic()
+            try:
+                ok = response_ok(await hotspots(c))
+            except httpx.HTTPError:
+                ok = False
+            samples.append((t0, (time.monotonic() - t0) * 1000.0, ok))
+
+    async def swapper(c: httpx.AsyncClient):
+        original = (await c.get("/api/v1/admin/model", headers=headers)).json()["active_version"]
+        for frac, version in ((1 / 3, args.to), (2 / 3, original)):
+            await asyncio.sleep(max(0.0, started + args.duration * frac - time.monotonic()))
+            t0 = time.monotonic()
+            r = await c.post("/api/v1/admin/model/swap", json={"version": version}, headers=headers)
+            t1 = time.monotonic()
+            windows.append((t0, t1 + args.sync_interval))
+            swaps.append({"to": version, "status": r.status_code, "request_s": round(t1 - t0, 3),
+                          **({k: r.json().get(k) for k in ("load_s", "warmup_s")} if r.status_code == 200 else {})})
+
+    limits = httpx.Limits(max_connections=args.concurrency + 1, max_keepalive_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(base_url=args.base, timeout=120.0, limits=limits) as c:
+        await asyncio.gather(swapper(c), *(load(c) for _ in range(args.concurrency)))
+
+    phases: Dict[str, Tuple[List[float], int]] = {"steady": ([], 0), "swapping": ([], 0)}
+    for t0, ms, ok in samples:
+        name = "swapping" if any(a <= t0 <= b for a, b in windows) else "steady"
+        lat, err = phases[name]
+        if ok:
+            lat.append(ms)
+        else:
+            phases[name] = (lat, err + 1)
+    return {k: _summary(*v) for k, v in phases.items()}, swaps
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--to", default="v2", help="교체할 모델 버전")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--duration", type=float, default=30.0)
+    ap.add_argument("--radius-km", type=float, default=1.0)
+    ap.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    ap.add_argument("--max-receipts", type=int, default=0)
+    ap.add_argument("--base-url", default=None)
+    ap.add_argument("--spawn", action="store_true")
+    ap.add_argument("--server", choices=["uvicorn", "prefork"], default="prefork")
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--port", type=int, default=8767)
+    ap.add_argument("--ocr-stub-port", type=int, default=8799)
+    ap.add_argument("--admin-token", default=os.getenv("ADMIN_TOKEN", "bench-admin"))
+    ap.add_argument("--sync-interval", type=float, default=float(os.getenv("MODEL_WATCH_INTERVAL_S", "5")))
+    ap.add_argument("--startup-timeout", type=float, default=120.0)
+    args = ap.parse_args()
+    random.seed(0)
+    args.base = args.base_url or f"http://127.0.0.1:{args.port}"
+
+    proc: Optional[subprocess.Popen] = None
+    try:
+        if args.spawn:
+            os.environ["ADMIN_TOKEN"] = args.admin_token
+            os.environ["MODEL_WATCH_INTERVAL_S"] = str(args.sync_interval)
+            proc = spawn_server(args)
+        asyncio.run(wait_ready(args.base, args.startup_timeout))
+        phases, swaps = asyncio.run(run(args))
+    finally:
+        if proc is not None:
+            proc.send_signal(signal.SIGTERM)
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    for s in swaps:
+        print(f"swap -> {s['to']}: HTTP {s['status']} in {s['request_s']}s "
+              f"(load {s.get('load_s')}s, warmup {s.get('warmup_s')}s)")
+    print(f"{'phase':<10} {'ok':>7} {'err':>5} {'p50':>8} {'p99':>8} {'max':>8}")
+    for name, r in phases.items():
+        print(f"{name:<10} {r['ok']:>7} {r['errors']:>5} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# app/scripts/check_incremental_parity.py
+"""
+증분 LSTM 예측과 전체 윈도우 추론의 일치 여부 확인 (모델 파일 없이 랜덤 가중치로 실행)
+
+  python -m app.scripts.check_incremental_parity
+
+1) 0 상태에서 1 step 씩 진행한 결과 == 전체 윈도우 forward
+2) refresh_every=1 (매주 전체 재계산) 결과 == 전체 윈도우 forward
+3) refresh_every=K 일 때 전체 윈도우 대비 최대 오차(drift) 보고, 재계산 주차에는 0
+실패 시 종료 코드 1
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+
+import numpy as np
+import torch
+
+from app.services.incremental_forecast import CellStateStore, advance_cells
+from app.services.model_service import LSTMWrapper
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--cells", type=int, default=256)
+    ap.add_argument("--features", type=int, default=12)
+    ap.add_argument("--seq-len", type=int, default=12)
+    ap.add_argument("--weeks", type=int, default=40)
+    ap.add_argument("--refresh-every", type=int, default=12)
+    ap.add_argument("--atol", type=float, default=1e-5)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    torch.manual_seed(args.seed)
+    rng = np.random.default_rng(args.seed)
+    model = LSTMWrapper(input_size=args.features).eval()
+    lstm = model.lstm
+    data = rng.standard_normal((args.cells, args.weeks, args.features)).astype(np.float32)
+    ids = [f"cell-{i}" for i in range(args.cells)]
+    T = args.seq_len
+    ok = True
+
+    def full(week: int) -> np.ndarray:
+        with torch.no_grad():
+            return model(torch.from_numpy(np.ascontiguousarray(data[:, week - T + 1:week + 1]))).numpy()
+
+    # 1) step-by-step == forward
+    with torch.no_grad():
+        state = None
+        for t in range(T):
+            y, state = model.forward_with_state(torch.from_numpy(data[:, t:t + 1]), state)
+    err = float(np.abs(y.numpy() - full(T - 1)).max())
+    print(f"[1] step-by-step vs full window: max|diff|={err:.2e}")
+    ok &= err <= args.atol
+
+    # 2) refresh_every=1, 3) refresh_every=K
+    for refresh_every in (1, args.refresh_every):
+        store = CellStateStore(lstm.num_layers, lstm.hidden_size, 4)
+        worst = 0.0
+        for week in range(T - 1, args.weeks):
+            preds = advance_cells(model, store, ids, data[:, week - T + 1:week + 1], week, refresh_every)
+            diff = float(np.abs(preds - full(week)).max())
+            if store.since_full[0] == 0 and diff > args.atol:
+                print(f"    week {week}: full recompute mismatch {diff:.2e}")
+                ok = False
+            worst = max(worst, diff)
+        label = "[2]" if refresh_every == 1 else "[3]"
+        print(f"{label} refresh_every={refresh_every}: max|diff| vs full window={worst:.2e}")
+        if refresh_every == 1:
+            ok &= worst <= args.atol
+
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
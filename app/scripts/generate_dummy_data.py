@@ -0,0 +1,258 @@
+# app/scripts/generate_dummy_data.py
+"""
+로컬 부하 테스트용 합성 데이터 생성
+
+  python -m app.scripts.generate_dummy_data --rows 100 --cols 100 --years 5
+
+생성물 (기본 출력 위치: <repo>/data)
+  grid/cells.json, grid/features.npy   격자 셀(id/centroid/polygon) + 주간 feature (N, weeks, F)
+  model/v1..vN/{best_lstm.pt, model_meta.json}, model/ACTIVE
+                                       버전별 랜덤 가중치 LSTM + 메타 (feature 순서/스케일러/seq_len)
+  merchants.json                       가맹점 목록 (셀/좌표/카테고리)
+  receipts/*.png, receipts.json        영수증 이미지 + 정답 가게명 (OCR 벤치마크용)
+  dummy_hotspots.json                  /hotspots/next-month 폴백 응답 형식의 샘플
+                                       (--out 이 <repo>/data 이면 운영 폴백 파일이므로 쓰지 않음)
+
+서버에서 사용하려면
+  GRID_DATA_DIR=data/grid MODEL_DIR=data/model uvicorn app.main:app
+(기본 모델 디렉터리의 실제 best_lstm.pt 는 덮어쓰지 않음)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[2]
+# hotspots 엔드포인트가 실제로 내보내는 폴백 파일 (합성 데이터로 덮어쓰지 않음)
+FALLBACK_PATH = ROOT / "data" / "dummy_hotspots.json"
+
+# 청주시 중심 (recommendation_service 의 mock 주소와 동일 지역)
+CENTER_LAT = 36.6424
+CENTER_LNG = 127.4890
+
+NUMERIC_COLS = ["visits", "sales", "avg_ticket", "new_customers", "temp_c", "rain_mm", "events"]
+BINARY_COLS = ["holiday_week", "festival", "school_vacation"]
+CATEGORIES = ["cafe", "brunch", "korean", "japanese", "dessert", "bar"]
+STORE_NAMES = ["스타벅스", "파리바게뜨", "교촌치킨", "이디야커피", "맘스터치", "김밥천국", "설빙", "투썸플레이스"]
+
+
+# ---------- 격자 ----------
+def make_cells(rows: int, cols: int, cell_m: float) -> Dict[str, Any]:
+    dlat = cell_m / 111_320.0
+    dlng = cell_m / (111_320.0 * math.cos(math.radians(CENTER_LAT)))
+    lat0 = CENTER_LAT - dlat * rows / 2
+    lng0 = CENTER_LNG - dlng * cols / 2
+
+    cell_ids: List[str] = []
+    centroids: List[List[float]] = []
+    polygons: List[List[List[float]]] = []
+    for r in range(rows):
+        for c in range(cols):
+            s, w = lat0 + r * dlat, lng0 + c * dlng
+            n, e = s + dlat, w + dlng
+            cell_ids.append(f"cell_{r:04d}_{c:04d}")
+            centroids.append([round(s + dlat / 2, 7), round(w + dlng / 2, 7)])
+            polygons.append([[round(x, 7), round(y, 7)] for x, y in
+                             ((w, s), (e, s), (e, n), (w, n), (w, s))])
+    return {
+        "cell_ids": cell_ids,
+        "centroids": centroids,
+        "polygons": polygons,
+        "feature_order": NUMERIC_COLS + BINARY_COLS,
+        "cell_m": cell_m,
+    }
+
+
+def write_features(path: Path, n_cells: int, weeks: int, rng: np.random.Generator, chunk: int = 2048) -> None:
+    """계절성 + 추세 + 잡음을 가진 주간 feature. 셀 단위로 나눠 memmap 에 기록"""
+    t = np.arange(weeks, dtype=np.float32)
+    season = np.sin(2 * np.pi * t / 52.0)
+    temp = 12.0 + 13.0 * np.sin(2 * np.pi * (t - 13) / 52.0) + rng.normal(0, 2.0, weeks)  # 도시 공통
+    rain = rng.gamma(0.6, 8.0, weeks) * (1 + 0.8 * np.clip(season, 0, None))
+    woy = t % 52
+    holiday = np.isin(woy, [0, 5, 6, 19, 33, 38, 39, 51]).astype(np.float32)
+    vacation = ((woy < 8) | ((woy >= 29) & (woy < 34))).astype(np.float32)
+
+    F = len(NUMERIC_COLS) + len(BINARY_COLS)
+    out = np.lib.format.open_memmap(str(path), mode="w+", dtype=np.float32, shape=(n_cells, weeks, F))
+    for start in range(0, n_cells, chunk):
+        n = min(chunk, n_cells - start)
+        base = rng.lognormal(4.0, 0.8, (n, 1))                    # 셀 인기도
+        trend = rng.normal(0.0, 0.3, (n, 1)) * (t / weeks)
+        amp = rng.uniform(0.1, 0.4, (n, 1))
+        visits = base * (1 + amp * season + trend + 0.2 * holiday) * rng.lognormal(0, 0.15, (n, weeks))
+        ticket = rng.uniform(8000, 15000, (n, 1)) * rng.lognormal(0, 0.05, (n, weeks))
+        festival = (rng.random((n, weeks)) < 0.02).astype(np.float32)
+        visits *= 1 + 0.5 * festival
+
+        block = out[start:start + n]
+        block[..., 0] = visits
+        block[..., 1] = visits * ticket
+        block[..., 2] = ticket
+        block[..., 3] = visits * rng.uniform(0.1, 0.3, (n, weeks))
+        block[..., 4] = temp
+        block[..., 5] = rain
+        block[..., 6] = rng.poisson(0.3, (n, weeks))
+        block[..., 7] = holiday
+        block[..., 8] = festival
+        block[..., 9] = vacation
+    out.flush()
+    del out
+
+
+# ---------- 모델 ----------
+def write_model(model_dir: Path, features: np.ndarray, seq_len: int, out_len: int, seed: int) -> None:
+    import torch
+    from app.services.model_service import LSTMWrapper
+
+    torch.manual_seed(seed)
+    F = features.shape[2]
+    model = LSTMWrapper(input_size=F, out_len=out_len)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    torch.save(model.state_dict(), str(model_dir / "best_lstm.pt"))
+
+    # 스케일러: 셀 일부 샘플로 평균/표준편차 (이진 컬럼은 0/1 그대로)
+    sample = np.asarray(features[:: max(1, features.shape[0] // 512)], dtype=np.float64).reshape(-1, F)
+    mean = sample.mean(axis=0)
+    scale = sample.std(axis=0)
+    nb = len(BINARY_COLS)
+    mean[-nb:], scale[-nb:] = 0.0, 1.0
+    meta = {
+        "seq_len": seq_len,
+        "input_dim": F,
+        "out_len": out_len,
+        "numeric_cols": NUMERIC_COLS,
+        "binary_cols": BINARY_COLS,
+        "scaler_mean": [float(x) for x in mean],
+        "scaler_scale": [float(x) if x > 0 else 1.0 for x in scale],
+        "note": "synthetic random-weight model (generate_dummy_data)",
+    }
+    with (model_dir / "model_meta.json").open("w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+# ---------- 가맹점 / 영수증 ----------
+def make_merchants(cells: Dict[str, Any], n: int, rng: np.random.Generator) -> List[Dict[str, Any]]:
+    idx = rng.integers(0, len(cells["cell_ids"]), n)
+    out = []
+    for i, ci in enumerate(idx):
+        lat, lng = cells["centroids"][ci]
+        cat = CATEGORIES[int(rng.integers(len(CATEGORIES)))]
+        out.append({
+            "id": f"m-{i:06d}",
+            "name": f"{STORE_NAMES[i % len(STORE_NAMES)]} {i // len(STORE_NAMES) + 1}호점",
+            "brand": STORE_NAMES[i % len(STORE_NAMES)],
+            "category": cat,
+            "cell_id": cells["cell_ids"][ci],
+            "lat": round(lat + float(rng.normal(0, 0.0005)), 7),
+            "lng": round(lng + float(rng.normal(0, 0.0005)), 7),
+            "address": f"청주시 흥덕구 합성로 {i + 1}",
+        })
+    return out
+
+
+def _png(width: int, height: int, pixels: np.ndarray) -> bytes:
+    """8bit 그레이스케일 PNG 인코딩 (외부 이미지 라이브러리 없이)"""
+    raw = b"".join(b"\x00" + pixels[y].tobytes() for y in range(height))
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 6))
+            + chunk(b"IEND", b""))
+
+
+def write_receipts(out_dir: Path, merchants: List[Dict[str, Any]], n: int, rng: np.random.Generator,
+                   width: int = 600, height: int = 1200) -> List[Dict[str, Any]]:
+    """흰 바탕에 글자 줄 모양의 가짜 영수증 이미지 (실제 업로드 크기와 비슷한 용량)"""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = []
+    for i in range(n):
+        m = merchants[int(rng.integers(len(merchants)))]
+        img = np.full((height, width), 245, dtype=np.uint8)
+        for y in range(60, height - 60, 28):
+            x1 = int(rng.integers(40, 120))
+            x2 = int(rng.integers(width // 2, width - 40))
+            img[y:y + 12, x1:x2] = rng.integers(0, 90, (12, x2 - x1), dtype=np.uint8)
+        img += rng.integers(0, 8, img.shape, dtype=np.uint8)
+        name = f"receipt_{i:05d}.png"
+        (out_dir / name).write_bytes(_png(width, height, img))
+        manifest.append({"file": name, "merchant_id": m["id"], "store_name": m["brand"],
+                         "total": int(rng.integers(3, 60)) * 1000})
+    return manifest
+
+
+def make_dummy_hotspots(cells: Dict[str, Any], n: int = 30) -> Dict[str, Any]:
+    feats = []
+    for i in range(min(n, len(cells["cell_ids"]))):
+        lat, lng = cells["centroids"][i]
+        feats.append({
+            "type": "Feature",
+            "geometry": {"type": "Polygon", "coordinates": [cells["polygons"][i]]},
+            "properties": {"cell_id": cells["cell_ids"][i], "score": 0.0,
+                           "centroid": {"lat": lat, "lng": lng}},
+        })
+    return {"type": "FeatureCollection", "features": feats}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--out", type=Path, default=ROOT / "data")
+    ap.add_argument("--rows", type=int, default=100)
+    ap.add_argument("--cols", type=int, default=100)
+    ap.add_argument("--cell-m", type=float, default=250.0)
+    ap.add_argument("--years", type=int, default=5)
+    ap.add_argument("--seq-len", type=int, default=12)
+    ap.add_argument("--out-len", type=int, default=4)
+    ap.add_argument("--model-versions", type=int, default=2, help="모델 교체 테스트용 버전 수")
+    ap.add_argument("--merchants", type=int, default=5000)
+    ap.add_argument("--receipts", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    out: Path = args.out
+    grid_dir = out / "grid"
+    grid_dir.mkdir(parents=True, exist_ok=True)
+
+    cells = make_cells(args.rows, args.cols, args.cell_m)
+    with (grid_dir / "cells.json").open("w", encoding="utf-8") as f:
+        json.dump(cells, f, ensure_ascii=False)
+    weeks = args.years * 52
+    write_features(grid_dir / "features.npy", len(cells["cell_ids"]), weeks, rng)
+    print(f"grid: {len(cells['cell_ids'])} cells x {weeks} weeks -> {grid_dir}")
+
+    features = np.load(str(grid_dir / "features.npy"), mmap_mode="r")
+    versions = [f"v{i + 1}" for i in range(max(1, args.model_versions))]
+    for i, version in enumerate(versions):
+        write_model(out / "model" / version, features, args.seq_len, args.out_len, args.seed + i)
+    (out / "model" / "ACTIVE").write_text(versions[0] + "\n", encoding="utf-8")
+    print(f"model: random-weight LSTM {', '.join(versions)} (active {versions[0]}) -> {out / 'model'}")
+
+    merchants = make_merchants(cells, args.merchants, rng)
+    with (out / "merchants.json").open("w", encoding="utf-8") as f:
+        json.dump(merchants, f, ensure_ascii=False)
+    manifest = write_receipts(out / "receipts", merchants, args.receipts, rng)
+    with (out / "receipts.json").open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    print(f"merchants: {len(merchants)}, receipts: {len(manifest)}")
+
+    dummy_path = out / "dummy_hotspots.json"
+    if dummy_path.resolve() == FALLBACK_PATH.resolve():
+        print(f"dummy hotspots: skipped ({dummy_path} is the production fallback)")
+    else:
+        with dummy_path.open("w", encoding="utf-8") as f:
+            json.dump(make_dummy_hotspots(cells), f, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# app/scripts/refresh_forecasts.py
+"""
+격자 전체 주간 예측 갱신 (증분 LSTM)
+
+  python -m app.scripts.refresh_forecasts                # 최신 주차 1회
+  python -m app.scripts.refresh_forecasts --from-week 120  # 120 주차부터 최신까지 따라잡기
+
+셀별 (h, c) 상태를 현재 모델 버전 디렉터리의 cell_state.npz 에 저장해 두고, 다음 주에는 새 주차 1 step 만 진행한다.
+LSTM_FULL_REFRESH_EVERY 주마다(기본 seq_len) 전체 윈도우로 다시 계산한다.
+/hotspots/next-month 는 같은 주차의 저장된 예측값이 있으면 그대로 사용한다.
+실행 중인 서버는 파일이 바뀐 것을 MODEL_WATCH_INTERVAL_S 안에 감지해 다시 로드한다 (재시작 불필요).
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.incremental_forecast import step_mask
+from app.services.map_service import get_grid
+from app.services.model_service import LSTMForecastService, ModelBundle
+
+
+def refresh_week(model: ModelBundle, week: int, batch_size: int) -> dict:
+    grid = get_grid()
+    cols = [grid.feature_order.index(c) for c in model.feature_order]
+    windows = grid.windows(week, model.seq_len)
+    store = model.cell_state if model.supports_incremental else None
+
+    stepped = 0
+    t0 = time.perf_counter()
+    for start in range(0, len(grid), batch_size):
+        ids = grid.cell_ids[start:start + batch_size]
+        if store is not None:
+            rows = store.rows(ids)
+            stepped += int(np.count_nonzero(step_mask(store, rows, week, model.refresh_every)))
+        model.advance(ids, windows[start:start + batch_size][:, :, cols], week)
+    return {"week": week, "cells": len(grid), "stepped": stepped,
+            "full": len(grid) - stepped, "seconds": time.perf_counter() - t0}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--from-week", type=int, default=None)
+    ap.add_argument("--to-week", type=int, default=None)
+    ap.add_argument("--batch-size", type=int, default=4096)
+    args = ap.parse_args()
+
+    model = LSTMForecastService().active  # 갱신 도중 버전이 바뀌지 않도록 번들을 고정
+    grid = get_grid()
+    to_week = grid.latest_week if args.to_week is None else args.to_week
+    from_week = to_week if args.from_week is None else args.from_week
+    from_week = max(from_week, model.seq_len - 1)
+
+    for week in range(from_week, to_week + 1):
+        r = refresh_week(model, week, args.batch_size)
+        print(f"week {r['week']}: {r['cells']} cells (step {r['stepped']}, full {r['full']}) "
+              f"in {r['seconds']:.2f}s")
+    model.save_cell_state()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# app/services/incremental_forecast.py
+"""
+셀 단위 LSTM 상태 캐시를 이용한 증분 예측
+- 주간 갱신 시 셀마다 seq_len 전체 윈도우를 다시 돌리지 않고,
+  저장해 둔 (h, c) 에서 새 주차 1 step 만 진행한 뒤 head 적용 → 약 seq_len 배 절감
+- 증분 상태는 윈도우 밖의 과거까지 누적되므로 전체 윈도우 추론과 조금씩 달라짐(drift)
+  → refresh_every 주마다 전체 윈도우로 다시 계산해 상한을 둠
+- 상태는 셀 id → 행 번호 매핑 + numpy 배열(h, c, week, since_full, preds)로 보관, .npz 로 저장
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+
+class CellStateStore:
+    """셀별 LSTM (h, c) 상태와 마지막 예측값을 배열로 보관"""
+
+    def __init__(self, layers: int, hidden: int, out_len: int, capacity: int = 1024, model_tag: str = ""):
+        self.layers = layers
+        self.hidden = hidden
+        self.out_len = out_len
+        self.model_tag = model_tag
+        self.cell_ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._alloc(max(1, capacity))
+
+    def _alloc(self, capacity: int) -> None:
+        self.h = np.zeros((capacity, self.layers, self.hidden), dtype=np.float32)
+        self.c = np.zeros((capacity, self.layers, self.hidden), dtype=np.float32)
+        self.week = np.full(capacity, -1, dtype=np.int64)          # 상태가 반영된 마지막 주차
+        self.since_full = np.zeros(capacity, dtype=np.int32)       # 마지막 전체 재계산 이후 step 수
+        self.preds = np.zeros((capacity, self.out_len), dtype=np.float32)
+
+    def _grow(self, need: int) -> None:
+        cap = len(self.week)
+        if need <= cap:
+            return
+        new_cap = max(need, cap * 2)
+        old = (self.h, self.c, self.week, self.since_full, self.preds)
+        self._alloc(new_cap)
+        n = len(self.cell_ids)
+        for dst, src in zip((self.h, self.c, self.week, self.since_full, self.preds), old):
+            dst[:n] = src[:n]
+
+    def __len__(self) -> int:
+        return len(self.cell_ids)
+
+    def rows(self, cell_ids: Sequence[str]) -> np.ndarray:
+        """셀 id 들의 행 번호. 처음 보는 셀은 새 행(week=-1)을 할당"""
+        new = [cid for cid in dict.fromkeys(cell_ids) if cid not in self._index]
+        if new:
+            self._grow(len(self.cell_ids) + len(new))
+            for cid in new:
+                self._index[cid] = len(self.cell_ids)
+                self.cell_ids.append(cid)
+        return np.fromiter((self._index[cid] for cid in cell_ids), dtype=np.int64, count=len(cell_ids))
+
+    def lookup(self, cell_id: str) -> Optional[int]:
+        return self._index.get(cell_id)
+
+    def get_state(self, rows: np.ndarray) -> Tuple[torch.Tensor, torch.Tensor]:
+        """torch LSTM 형식 (layers, B, hidden)"""
+        h = torch.from_numpy(np.ascontiguousarray(self.h[rows].transpose(1, 0, 2)))
+        c = torch.from_numpy(np.ascontiguousarray(self.c[rows].transpose(1, 0, 2)))
+        return h, c
+
+    def set_state(self, rows: np.ndarray, state: Tuple[torch.Tensor, torch.Tensor]) -> None:
+        h, c = state
+        self.h[rows] = h.detach().cpu().numpy().transpose(1, 0, 2)
+        self.c[rows] = c.detach().cpu().numpy().transpose(1, 0, 2)
+
+    # ---------- 저장/로드 ----------
+    def save(self, path: Path) -> None:
+        n = len(self.cell_ids)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as f:
+            np.savez(
+                f,
+                cell_ids=np.array(self.cell_ids, dtype=str),
+                h=self.h[:n], c=self.c[:n], week=self.week[:n],
+                since_full=self.since_full[:n], preds=self.preds[:n],
+                model_tag=np.array(self.model_tag),
+            )
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path, model_tag: str = "") -> Optional["CellStateStore"]:
+        """저장된 상태를 로드. 모델이 바뀌었으면(model_tag 불일치) None"""
+        with np.load(str(path), allow_pickle=False) as z:
+            if model_tag and str(z["model_tag"]) != model_tag:
+                return None
+            h = z["h"]
+            n, layers, hidden = h.shape
+            store = cls(layers, hidden, z["preds"].shape[1], capacity=n, model_tag=model_tag)
+            store.rows([str(c) for c in z["cell_ids"]])
+            store.h[:n] = h
+            store.c[:n] = z["c"]
+            store.week[:n] = z["week"]
+            store.since_full[:n] = z["since_full"]
+            store.preds[:n] = z["preds"]
+        return store
+
+
+def step_mask(store: CellStateStore, rows: np.ndarray, week: int, refresh_every: int) -> np.ndarray:
+    """
+    1 step 만 진행할 셀 (나머지는 전체 윈도우 재계산)
+    - 상태가 직전 주차(week-1)이고, 이번 step 을 더해도 전체 재계산 후 refresh_every 주 미만인 셀
+    - since_full 은 전체 재계산 직후 0 이므로 refresh_every 주마다 정확히 1번 전체 재계산
+      (refresh_every=1 이면 매주 전체 재계산)
+    """
+    return (store.week[rows] == week - 1) & (store.since_full[rows] + 1 < refresh_every)
+
+
+def advance_cells(
+    model: nn.Module,
+    store: CellStateStore,
+    cell_ids: Sequence[str],
+    windows: np.ndarray,
+    week: int,
+    refresh_every: int,
+) -> np.ndarray:
+    """
+    windows: (B, seq_len, F) 스케일 적용된 입력, 마지막 행이 week 주차
+    - step_mask 에 해당하는 셀(상태가 week-1, 재계산 주기 전) → 마지막 1 step 만 진행
+    - 그 외(처음 보는 셀, 주차가 끊긴 셀, 재계산 주기 도달) → 전체 윈도우로 재계산
+    return: (B, out_len) 예측값 (store.preds 에도 기록)
+    """
+    rows = store.rows(cell_ids)
+    mask = step_mask(store, rows, week, refresh_every)
+    step_idx = np.nonzero(mask)[0]
+    full_idx = np.nonzero(~mask)[0]
+
+    with torch.no_grad():
+        if len(step_idx):
+            r = rows[step_idx]
+            x = torch.from_numpy(np.ascontiguousarray(windows[step_idx, -1:, :], dtype=np.float32))
+            y, state = model.forward_with_state(x, store.get_state(r))
+            store.set_state(r, state)
+            store.preds[r] = y.cpu().numpy()
+            store.since_full[r] += 1
+        if len(full_idx):
+            r = rows[full_idx]
+            x = torch.from_numpy(np.ascontiguousarray(windows[full_idx], dtype=np.float32))
+            y, state = model.forward_with_state(x)
+            store.set_state(r, state)
+            store.preds[r] = y.cpu().numpy()
+            store.since_full[r] = 0
+
+    store.week[rows] = week
+    return store.preds[rows]
@@ -0,0 +1,376 @@
+# app/services/job_queue.py
+"""
+LLM 생성 작업(캠페인/홍보 문구)용 백그라운드 작업 큐
+- 제출 즉시 job id 반환 → 클라이언트는 GET /ai/jobs/{id} 로 폴링 (또는 callback_url 로 결과 수신)
+- SQLite 파일에 저장하므로 재시작 후에도 대기/실행 중 작업이 이어서 처리됨
+- 프로세스마다 JOB_WORKERS 개의 워커가 동시에 처리 (pre-fork 워커 수만큼 처리량 증가)
+- 같은 종류·같은 입력의 작업이 대기/실행 중이면 새로 만들지 않고 기존 id 반환
+  (callback_url 이 다르면 기존 작업에 추가 → 완료 시 제출자 모두에게 전송)
+- 완료 결과는 JOB_RESULT_TTL_S 동안만 보관
+- upstream 과부하(UpstreamOverloaded)로 거절된 실행은 실패로 세지 않고 Retry-After 뒤에 재실행
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+
+import httpx
+
+from ..core.config import settings
+from ..schemas.job import check_callback_url
+from .upstream_scheduler import UpstreamOverloaded, retry_after_seconds
+
+log = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           TEXT PRIMARY KEY,
+    kind         TEXT NOT NULL,
+    payload      TEXT NOT NULL,
+    dedup_key    TEXT NOT NULL,
+    status       TEXT NOT NULL,          -- pending | running | done | failed
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    result       TEXT,
+    error        TEXT,
+    created_at   REAL NOT NULL,
+    updated_at   REAL NOT NULL,
+    run_after    REAL NOT NULL,          -- 재시도 backoff
+    lease_until  REAL,                   -- 실행 중 작업의 임대 만료 (프로세스가 죽으면 재실행)
+    expires_at   REAL                    -- 완료 결과 보관 만료
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_claim ON jobs (status, run_after, created_at);
+CREATE INDEX IF NOT EXISTS ix_jobs_dedup ON jobs (dedup_key, status);
+CREATE TABLE IF NOT EXISTS job_callbacks (
+    job_id TEXT NOT NULL,
+    url    TEXT NOT NULL,
+    PRIMARY KEY (job_id, url)
+);
+"""
+
+
+def _dedup_key(kind: str, payload: Dict[str, Any]) -> str:
+    raw = json.dumps([kind, payload], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class JobQueue:
+    def __init__(
+        self,
+        db_path: Path,
+        workers: int = 2,
+        result_ttl: float = 86400.0,
+        lease_s: float = 300.0,
+        max_attempts: int = 3,
+        poll_interval: float = 0.5,
+    ):
+        self.db_path = db_path
+        self.workers = max(1, workers)
+        self.result_ttl = result_ttl
+        self.lease_s = lease_s
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self._handlers: Dict[str, JobHandler] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._callbacks: Set[asyncio.Task] = set()
+        self._running = 0
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    # ---------- 수명 주기 ----------
+    async def start(self) -> None:
+        """앱 시작 시 호출 (pre-fork 모드에서는 fork 이후 워커 프로세스마다 실행)"""
+        if self._tasks:
+            return
+        await asyncio.to_thread(self._open)
+        self._wakeup = asyncio.Event()
+        for i in range(self.workers):
+            self._spawn(self._worker(i))
+        self._spawn(self._janitor())
+
+    async def stop(self) -> None:
+        for t in list(self._tasks) + list(self._callbacks):
+            t.cancel()
+        await asyncio.gather(*self._tasks, *self._callbacks, return_exceptions=True)
+        self._tasks.clear()
+        self._callbacks.clear()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _spawn(self, coro) -> None:
+        t = asyncio.create_task(coro)
+        self._tasks.add(t)
+        t.add_done_callback(self._tasks.discard)
+
+    # ---------- 공개 API ----------
+    async def submit(self, kind: str, payload: Dict[str, Any], callback_url: Optional[str] = None) -> Dict[str, Any]:
+        if kind not in self._handlers:
+            raise KeyError(f"unknown job kind: {kind}")
+        job = await asyncio.to_thread(self._submit_sync, kind, payload, callback_url)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get_sync, job_id)
+
+    async def stats(self) -> Dict[str, Any]:
+        counts = await asyncio.to_thread(self._counts_sync)
+        return {"workers": self.workers, "running_here": self._running, "jobs": counts}
+
+    # ---------- 워커 ----------
+    async def _worker(self, n: int) -> None:
+        while True:
+            try:
+                job = await asyncio.to_thread(self._claim_sync)
+            except sqlite3.Error:
+                log.exception("job claim failed")
+                job = None
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        if job["attempts"] > self.max_attempts:
+            # 실행 도중 프로세스가 반복해서 죽은 작업
+            await asyncio.to_thread(self._fail_sync, job["id"], "lease expired too many times", True, job["attempts"])
+            self._notify(job["id"])
+            return
+        handler = self._handlers.get(job["kind"])
+        self._running += 1
+        try:
+            if handler is None:
+                raise KeyError(f"unknown job kind: {job['kind']}")
+            result = await handler(json.loads(job["payload"]))
+        except asyncio.CancelledError:
+            # 종료 중: 대기 상태로 되돌려 재시작 후(또는 다른 프로세스에서) 다시 실행
+            self._requeue_sync(job["id"])
+            raise
+        except UpstreamOverloaded as e:
+            # 스케줄러가 백그라운드 호출을 덜어낸 경우(트래픽 급증/upstream 429): 실패가 아니라 대기
+            # 시도 횟수를 쓰지 않고 Retry-After 뒤에 다시 실행
+            delay = retry_after_seconds(e.headers or {})
+            log.info("job %s (%s) deferred %.0fs: %s", job["id"], job["kind"], delay, e.reason)
+            await asyncio.to_thread(self._requeue_sync, job["id"], delay)
+            return
+        except Exception as e:
+            log.warning("job %s (%s) attempt %s failed: %s", job["id"], job["kind"], job["attempts"], e)
+            final = job["attempts"] >= self.max_attempts
+            await asyncio.to_thread(self._fail_sync, job["id"], repr(e), final, job["attempts"])
+            if final:
+                self._notify(job["id"])
+            return
+        finally:
+            self._running -= 1
+        await asyncio.to_thread(self._finish_sync, job["id"], result)
+        self._notify(job["id"])
+
+    def _notify(self, job_id: str) -> None:
+        t = asyncio.create_task(self._post_callbacks(job_id))
+        self._callbacks.add(t)
+        t.add_done_callback(self._callbacks.discard)
+
+    async def _post_callbacks(self, job_id: str) -> None:
+        urls = await asyncio.to_thread(self._callback_urls_sync, job_id)
+        if not urls:
+            return
+        job = await self.get(job_id)
+        if job is None:
+            return
+        async with httpx.AsyncClient(timeout=10.0, follow_redirects=False) as client:
+            await asyncio.gather(*(self._post_callback(client, job, url) for url in urls))
+
+    async def _post_callback(self, client: httpx.AsyncClient, job: Dict[str, Any], url: str) -> None:
+        try:
+            # 제출 이후 허용 호스트 설정이 바뀌었을 수 있으므로 보내기 직전에 다시 확인
+            check_callback_url(url)
+        except ValueError as e:
+            log.warning("job %s callback to %s skipped: %s", job["job_id"], url, e)
+            return
+        for attempt in range(3):
+            try:
+                r = await client.post(url, json=job)
+                if r.status_code < 500:
+                    return
+            except httpx.HTTPError as e:
+                log.warning("job %s callback to %s failed: %s", job["job_id"], url, e)
+            await asyncio.sleep(2 ** attempt)
+
+    async def _janitor(self) -> None:
+        while True:
+            await asyncio.sleep(60)
+            try:
+                await asyncio.to_thread(self._purge_sync)
+            except sqlite3.Error:
+                log.exception("job purge failed")
+
+    # ---------- SQLite (스레드에서 실행) ----------
+    def _open(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=10.0, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        self._conn = conn
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._open()
+        return self._conn
+
+    def _submit_sync(self, kind: str, payload: Dict[str, Any], callback_url: Optional[str]) -> Dict[str, Any]:
+        key = _dedup_key(kind, payload)
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT id, status FROM jobs WHERE dedup_key=? AND status IN ('pending','running') LIMIT 1",
+                    (key,),
+                ).fetchone()
+                if row is not None:
+                    job_id, status, deduplicated = row["id"], row["status"], True
+                else:
+                    job_id, status, deduplicated = uuid.uuid4().hex, "pending", False
+                    db.execute(
+                        "INSERT INTO jobs (id, kind, payload, dedup_key, status, created_at, updated_at, run_after)"
+                        " VALUES (?, ?, ?, ?, 'pending', ?, ?, ?)",
+                        (job_id, kind, json.dumps(payload, ensure_ascii=False), key, now, now, now),
+                    )
+                if callback_url:
+                    # 중복 제출이어도 이 제출자의 callback 은 기존 작업에 추가 (상태 확인과 같은 트랜잭션)
+                    db.execute("INSERT OR IGNORE INTO job_callbacks (job_id, url) VALUES (?, ?)", (job_id, callback_url))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return {"job_id": job_id, "status": status, "deduplicated": deduplicated}
+
+    def _claim_sync(self) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT * FROM jobs WHERE (status='pending' AND run_after<=?)"
+                    " OR (status='running' AND lease_until<?) ORDER BY created_at LIMIT 1",
+                    (now, now),
+                ).fetchone()
+                if row is None:
+                    db.execute("COMMIT")
+                    return None
+                db.execute(
+                    "UPDATE jobs SET status='running', attempts=attempts+1, lease_until=?, updated_at=? WHERE id=?",
+                    (now + self.lease_s, now, row["id"]),
+                )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        job = dict(row)
+        job["attempts"] += 1
+        return job
+
+    def _finish_sync(self, job_id: str, result: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._db().execute(
+                "UPDATE jobs SET status='done', result=?, error=NULL, lease_until=NULL, updated_at=?, expires_at=?"
+                " WHERE id=?",
+                (json.dumps(result, ensure_ascii=False), now, now + self.result_ttl, job_id),
+            )
+
+    def _fail_sync(self, job_id: str, error: str, final: bool, attempts: int) -> None:
+        now = time.time()
+        with self._lock:
+            if final:
+                self._db().execute(
+                    "UPDATE jobs SET status='failed', error=?, lease_until=NULL, updated_at=?, expires_at=? WHERE id=?",
+                    (error, now, now + self.result_ttl, job_id),
+                )
+            else:
+                self._db().execute(
+                    "UPDATE jobs SET status='pending', error=?, lease_until=NULL, updated_at=?, run_after=? WHERE id=?",
+                    (error, now, now + 2 ** attempts, job_id),
+                )
+
+    def _requeue_sync(self, job_id: str, delay: float = 0.0) -> None:
+        now = time.time()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute(
+                    # 정상 종료/upstream 과부하로 중단된 실행은 시도 횟수에서 제외 (max_attempts 를 소모하지 않도록)
+                    "UPDATE jobs SET status='pending', attempts=MAX(attempts-1, 0), lease_until=NULL, updated_at=?,"
+                    " run_after=? WHERE id=? AND status='running'",
+                    (now, now + delay, job_id),
+                )
+
+    def _get_sync(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db().execute("SELECT * FROM jobs WHERE id=?", (job_id,)).fetchone()
+        if row is None or (row["expires_at"] is not None and row["expires_at"] < time.time()):
+            return None
+        return {
+            "job_id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"] if row["status"] == "failed" else None,
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    def _callback_urls_sync(self, job_id: str) -> List[str]:
+        with self._lock:
+            rows = self._db().execute("SELECT url FROM job_callbacks WHERE job_id=?", (job_id,)).fetchall()
+        return [r["url"] for r in rows]
+
+    def _counts_sync(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {r["status"]: r["n"] for r in rows}
+
+    def _purge_sync(self) -> None:
+        with self._lock:
+            db = self._db()
+            expired = "SELECT id FROM jobs WHERE expires_at IS NOT NULL AND expires_at<?"
+            now = time.time()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute(f"DELETE FROM job_callbacks WHERE job_id IN ({expired})", (now,))
+                db.execute(f"DELETE FROM jobs WHERE id IN ({expired})", (now,))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+
+job_queue = JobQueue(
+    Path(settings.JOB_DB_PATH),
+    workers=settings.JOB_WORKERS,
+    result_ttl=settings.JOB_RESULT_TTL_S,
+)
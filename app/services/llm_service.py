@@ -2,6 +2,8 @@
 from typing import Dict, Any
 from ..schemas.promotion import PromotionResponse
 from ..core.config import settings
+from .upstream_scheduler import Priority
+from .recommendation_service import extract_json_block, generate_gemini
 import google.generativeai as genai
 
 class LLMService:
@@ -10,7 +12,8 @@ class LLMService:
         # 텍스트 생성 전용 모델로 변경
         self.text_model = genai.GenerativeModel('gemini-pro') 
 
-    def generate_promotion(self, store_name: str, description: str) -> PromotionResponse:
+    async def generate_promotion(self, store_name: str, description: str,
+                                 priority: Priority = Priority.BACKGROUND) -> PromotionResponse:
         """
         가게 설명과 이름으로 홍보 문구와 이미지를 생성합니다.
         Gemini는 텍스트만 생성하며, 이미지는 임시 URL을 사용합니다.
@@ -20,11 +23,9 @@ class LLMService:
             f"'{store_name}'의 홍보 문구를 작성해줘. 다음 내용을 참고해줘: {description}"
             "친절하고 흥미로운 어조로 작성해줘. 50자 이내로."
         )
-        try:
-            response_text = self.text_model.generate_content(prompt_text).text
-        except Exception as e:
-            print(f"Gemini 텍스트 생성 실패: {e}")
-            response_text = "매력적인 홍보 문구 생성에 실패했습니다."
+        # 홍보 문구 생성은 백그라운드 우선순위 (사용자 요청형 호출에 Gemini 한도를 양보)
+        # 429 는 UpstreamOverloaded, 그 밖의 오류도 그대로 올려 작업 큐가 재시도하게 함
+        response_text = (await generate_gemini(self.text_model, prompt_text, priority)).text
 
         # --- 이미지 생성 로직 (Gemini가 직접 이미지 생성을 지원하지 않음) ---
         # Gemini-pro-vision은 이미지를 입력받아 텍스트를 생성하는 모델입니다.
@@ -37,4 +38,44 @@ class LLMService:
             promotional_text=response_text,
             image_url=image_url,
             image_description=image_description
-        )
\ No newline at end of file
+        )
+
+    async def generate_campaign(self, store_name: str, event_type: str, details: str,
+                                priority: Priority = Priority.BACKGROUND) -> Dict[str, Any]:
+        """
+        행사 종류/내용으로 캠페인 홍보 카피를 생성합니다. (작업 큐에서 백그라운드로 실행)
+        포스터 이미지는 generate_promotion 과 같이 임시 URL을 사용합니다.
+        """
+        prompt_text = (
+            f"'{store_name}'의 '{event_type}' 행사 홍보 카피를 작성해줘. 행사 내용: {details}\n"
+            "JSON으로만 답해줘: {\"headline\": 20자 이내 제목, \"body\": 100자 이내 본문, "
+            "\"hashtags\": 해시태그 3~5개 리스트}"
+        )
+        resp = await generate_gemini(self.text_model, prompt_text, priority)
+        try:
+            copy = extract_json_block(resp.text or "")
+        except ValueError:
+            copy = {"headline": store_name, "body": (resp.text or "").strip(), "hashtags": []}
+
+        return {
+            "store_name": store_name,
+            "event_type": event_type,
+            "headline": copy.get("headline", ""),
+            "body": copy.get("body", ""),
+            "hashtags": list(copy.get("hashtags", [])),
+            "poster_url": "https://via.placeholder.com/600x800?text=AI+Campaign+Poster",
+        }
+
+    async def generate_explanation(self, cell_id: str, target_month: str, lift: float, score: float,
+                                   priority: Priority = Priority.INTERACTIVE) -> Dict[str, Any]:
+        """예측 결과(셀/월/상승률/점수)에 대한 요약, 이유, 액션 제안"""
+        prompt_text = (
+            f"상권 격자 '{cell_id}'의 {target_month} 방문 수요 예측: 상승률 {lift:.2f}, 점수 {score:.2f}.\n"
+            "소상공인에게 설명하듯 JSON으로만 답해줘: "
+            "{\"summary\": 한 문장 요약, \"reasons\": 이유 리스트, \"actions\": 추천 행동 리스트}"
+        )
+        resp = await generate_gemini(self.text_model, prompt_text, priority)
+        try:
+            return extract_json_block(resp.text or "")
+        except ValueError:
+            return {"summary": (resp.text or "").strip(), "reasons": [], "actions": []}
@@ -1,12 +1,121 @@
 # backend/app/services/map_service.py
 
-from typing import Dict, Any
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import json
+import os
+import numpy as np
+
 from ..core.config import settings
 
+
+# 격자(cell) 데이터 위치: <repo>/data/grid/{cells.json, features.npy}
+GRID_DIR = Path(os.getenv("GRID_DATA_DIR", str(Path(__file__).resolve().parents[2] / "data" / "grid")))
+CELLS_PATH = GRID_DIR / "cells.json"
+FEATURES_PATH = GRID_DIR / "features.npy"
+
+EARTH_RADIUS_KM = 6371.0
+
+
+class GridStore:
+    """
+    - cells.json : cell_ids / centroids([lat,lng]) / polygons([[lng,lat],...]) / feature_order
+    - features.npy : (n_cells, n_weeks, n_features) float32 주간 feature 배열
+    - features.npy 는 mmap(읽기 전용)으로 열어 여러 워커 프로세스가 같은 페이지 캐시를 공유
+    - 좌표/인덱스 배열도 읽기 전용으로 고정 → fork 이후 copy-on-write 복사가 일어나지 않음
+    """
+    def __init__(self, grid_dir: Path = GRID_DIR):
+        cells_path = grid_dir / "cells.json"
+        features_path = grid_dir / "features.npy"
+        if not cells_path.exists():
+            raise FileNotFoundError(f"Grid cells file not found: {cells_path}")
+        if not features_path.exists():
+            raise FileNotFoundError(f"Grid features file not found: {features_path}")
+
+        with cells_path.open("r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        self.cell_ids: List[str] = [str(c) for c in meta["cell_ids"]]
+        self.feature_order: List[str] = list(meta["feature_order"])
+        self.polygons: List[List[List[float]]] = meta["polygons"]
+        self._index: Dict[str, int] = {cid: i for i, cid in enumerate(self.cell_ids)}
+
+        centroids = np.asarray(meta["centroids"], dtype=np.float64)
+        self.centroids = _frozen(centroids)
+        # 반경 검색용 라디안 좌표 (미리 계산)
+        self._lat_rad = _frozen(np.radians(centroids[:, 0]))
+        self._lng_rad = _frozen(np.radians(centroids[:, 1]))
+        self._cos_lat = _frozen(np.cos(self._lat_rad))
+
+        self.features: np.ndarray = np.load(str(features_path), mmap_mode="r")  # (N, W, F)
+        if self.features.shape[0] != len(self.cell_ids):
+            raise ValueError(
+                f"features rows({self.features.shape[0]}) != cells({len(self.cell_ids)})"
+            )
+
+    def __len__(self) -> int:
+        return len(self.cell_ids)
+
+    def index_of(self, cell_id: str) -> Optional[int]:
+        return self._index.get(cell_id)
+
+    def nearby(self, lat: float, lng: float, radius_km: float) -> List[str]:
+        """centroid 기준 haversine 거리로 반경 내 셀을 가까운 순으로 반환"""
+        lat_r, lng_r = np.radians(lat), np.radians(lng)
+        dlat = self._lat_rad - lat_r
+        dlng = self._lng_rad - lng_r
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat_r) * self._cos_lat * np.sin(dlng / 2) ** 2
+        dist = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        idx = np.nonzero(dist <= radius_km)[0]
+        idx = idx[np.argsort(dist[idx], kind="stable")]
+        return [self.cell_ids[i] for i in idx]
+
+    def last_weeks(self, cell_id: str, weeks: int) -> np.ndarray:
+        """(weeks, F) 읽기 전용 뷰. 셀이 없으면 (0, F)"""
+        i = self._index.get(cell_id)
+        if i is None:
+            return self.features[:0, 0, :]
+        return self.features[i, -weeks:, :]
+
+    @property
+    def latest_week(self) -> int:
+        return self.features.shape[1] - 1
+
+    def windows(self, week: int, weeks: int) -> np.ndarray:
+        """모든 셀의 week 주차까지 최근 weeks 주 (N, weeks, F) 읽기 전용 뷰"""
+        if week + 1 < weeks:
+            raise ValueError(f"week({week}) has fewer than {weeks} weeks of history")
+        return self.features[:, week - weeks + 1:week + 1, :]
+
+    def touch(self) -> None:
+        """feature 페이지를 미리 읽어 페이지 캐시에 올려둠 (fork 전 마스터에서 1회 호출)"""
+        if self.features.size:
+            float(np.asarray(self.features).sum(dtype=np.float64))
+
+
+def _frozen(arr: np.ndarray) -> np.ndarray:
+    arr = np.ascontiguousarray(arr)
+    arr.setflags(write=False)
+    return arr
+
+
+_grid: Optional[GridStore] = None
+
+
+def get_grid() -> GridStore:
+    """프로세스당 1회 로드 (pre-fork 모드에서는 마스터에서 로드되어 워커가 공유)"""
+    global _grid
+    if _grid is None:
+        _grid = GridStore()
+    return _grid
+
+
 class MapService:
     def __init__(self):
         self.api_key = settings.NAVER_MAPS_API_KEY
-        
+
     def get_nearby_stores(self, lat: float, lng: float, radius: int) -> Dict[str, Any]:
         """
         주변 상점 정보를 가져오는 목업(mockup) 메서드
@@ -31,7 +140,7 @@ class MapService:
                 }
             ]
         }
-    
+
     def get_coordinates_from_address(self, address: str) -> Dict[str, float]:
         """
         주소로부터 위도, 경도를 가져오는 목업 메서드
@@ -40,4 +149,32 @@ class MapService:
         return {
             "lat": 37.5665,
             "lng": 126.9780
-        }
\ No newline at end of file
+        }
+
+    # ---------- 격자(cell) 데이터 ----------
+    def get_nearby_cells(self, lat: float, lng: float, radius_km: float) -> List[str]:
+        """반경 radius_km 내 셀 id (가까운 순)"""
+        return get_grid().nearby(lat, lng, radius_km)
+
+    def load_cell_features_last_weeks(self, cell_id: str, weeks: int) -> List[Dict[str, float]]:
+        """최근 weeks 주의 feature 를 {col: value} 리스트로 반환"""
+        grid = get_grid()
+        mat = grid.last_weeks(cell_id, weeks)
+        cols = grid.feature_order
+        return [dict(zip(cols, row.tolist())) for row in mat]
+
+    def latest_week(self) -> int:
+        return get_grid().latest_week
+
+    def get_cell_polygon(self, cell_id: str) -> List[List[float]]:
+        grid = get_grid()
+        i = grid.index_of(cell_id)
+        return grid.polygons[i] if i is not None else []
+
+    def get_cell_centroid(self, cell_id: str) -> Tuple[float, float]:
+        grid = get_grid()
+        i = grid.index_of(cell_id)
+        if i is None:
+            raise KeyError(cell_id)
+        lat, lng = grid.centroids[i]
+        return float(lat), float(lng)
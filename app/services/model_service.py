@@ -1,17 +1,95 @@
 # app/services/model_service.py
 from __future__ import annotations
 from pathlib import Path
-from typing import Dict, List, Sequence, Optional
+from typing import Any, Dict, List, Sequence, Optional, Tuple
 
+import asyncio
 import json
+import logging
+import os
+import threading
+import time
 import numpy as np
 import torch
 import torch.nn as nn
 
+from ..core.config import settings
+from .incremental_forecast import CellStateStore, advance_cells
 
-MODELS_DIR = Path(__file__).parent / "models"
-MODEL_PATH = MODELS_DIR / "best_lstm.pt"
-META_PATH = MODELS_DIR / "model_meta.json"
+log = logging.getLogger(__name__)
+
+# 모델 디렉터리 구조
+#   <MODEL_DIR>/<version>/{best_lstm.pt, model_meta.json}   버전별 체크포인트
+#   <MODEL_DIR>/ACTIVE                                        현재 버전 이름 (교체 시 원자적으로 갱신)
+#   <MODEL_DIR>/{best_lstm.pt, model_meta.json}             (구 구조) 버전 "default" 로 취급
+MODELS_DIR = Path(settings.MODEL_DIR)
+ACTIVE_PATH = MODELS_DIR / "ACTIVE"
+MODEL_FILE = "best_lstm.pt"
+META_FILE = "model_meta.json"
+CELL_STATE_FILE = "cell_state.npz"
+LEGACY_VERSION = "default"
+
+# 증분 예측 시 전체 윈도우 재계산 주기(주). 기본값은 seq_len
+FULL_REFRESH_EVERY = settings.LSTM_FULL_REFRESH_EVERY
+# 교체 전 새 모델 워밍업 배치 크기 / 다른 워커의 교체를 감지하는 주기(초)
+WARMUP_BATCH = settings.MODEL_WARMUP_BATCH
+WATCH_INTERVAL_S = settings.MODEL_WATCH_INTERVAL_S
+
+
+class ModelSwapInProgress(RuntimeError):
+    pass
+
+
+class ModelVersionPinned(RuntimeError):
+    """MODEL_VERSION 으로 버전이 고정되어 있으면 교체하지 않음 (워커 동기화가 고정 버전으로 되돌리지 않도록)"""
+    pass
+
+
+def pinned_version() -> Optional[str]:
+    return settings.MODEL_VERSION or None
+
+
+def list_versions() -> List[str]:
+    """사용 가능한 모델 버전 (체크포인트와 메타가 모두 있는 디렉터리)"""
+    versions = []
+    if (MODELS_DIR / MODEL_FILE).exists() and (MODELS_DIR / META_FILE).exists():
+        versions.append(LEGACY_VERSION)
+    if MODELS_DIR.is_dir():
+        for d in sorted(MODELS_DIR.iterdir()):
+            if d.is_dir() and (d / MODEL_FILE).exists() and (d / META_FILE).exists():
+                versions.append(d.name)
+    return versions
+
+
+def version_dir(version: str) -> Path:
+    if version not in list_versions():
+        raise FileNotFoundError(f"Model version not found: {version} (in {MODELS_DIR})")
+    return MODELS_DIR if version == LEGACY_VERSION else MODELS_DIR / version
+
+
+def read_active_version() -> str:
+    """MODEL_VERSION 환경 변수 > ACTIVE 파일 > 구 구조(default) > 이름순 마지막 버전"""
+    pinned = pinned_version()
+    if pinned:
+        return pinned
+    versions = list_versions()
+    if ACTIVE_PATH.exists():
+        name = ACTIVE_PATH.read_text(encoding="utf-8").strip()
+        if name in versions:
+            return name
+        log.warning("ACTIVE points to unknown model version %r", name)
+    if not versions:
+        raise FileNotFoundError(
+            f"No model under {MODELS_DIR}: need {MODEL_FILE} and {META_FILE} "
+            f"(set MODEL_DIR, e.g. data/model from app.scripts.generate_dummy_data)"
+        )
+    return LEGACY_VERSION if LEGACY_VERSION in versions else versions[-1]
+
+
+def write_active_version(version: str) -> None:
+    tmp = ACTIVE_PATH.with_name(ACTIVE_PATH.name + ".tmp")
+    tmp.write_text(version + "\n", encoding="utf-8")
+    tmp.replace(ACTIVE_PATH)
 
 
 class LSTMWrapper(nn.Module):
@@ -25,36 +103,37 @@ class LSTMWrapper(nn.Module):
         self.head = nn.Linear(hidden, out_len)
 
     def forward(self, x):  # x: (B, T, F)
-        out, _ = self.lstm(x)
+        y, _ = self.forward_with_state(x)
+        return y  # (B, out_len)
+
+    def forward_with_state(
+        self, x: torch.Tensor, state: Optional[Tuple[torch.Tensor, torch.Tensor]] = None
+    ) -> Tuple[torch.Tensor, Tuple[torch.Tensor, torch.Tensor]]:
+        """x: (B, T, F), state: (h, c) 각 (layers, B, hidden). 증분 예측용으로 최종 상태도 반환"""
+        out, state = self.lstm(x, state)
         last = out[:, -1, :]
-        y = self.head(last)  # (B, out_len)
-        return y
+        return self.head(last), state
 
 
-class LSTMForecastService:
+class ModelBundle:
     """
-    - model_meta.json 을 읽어 feature 순서/스케일러/seq_len을 적용
-    - best_lstm.pt 로드를 싱글톤처럼 1회만 수행
-    - 입력: 최근 seq_len 기간의 feature 시계열 (딕셔너리 리스트)
-    - 출력: 예측값 벡터(list[float])
+    모델 한 버전에 대한 모든 것: 메타(feature 순서/스케일러/seq_len), 가중치, 셀 상태 캐시
+    - 로드 후에는 교체하지 않고, 새 버전은 새 번들로 만들어 포인터만 바꾼다
+    - 예측 캐시(cell_state)는 번들에 묶여 있으므로 버전이 바뀌면 자연히 무효화됨
     """
-    _instance: Optional["LSTMForecastService"] = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._loaded = False
-        return cls._instance
+    def __init__(self, version: str, model_dir: Path):
+        meta_path = model_dir / META_FILE
+        model_path = model_dir / MODEL_FILE
+        if not meta_path.exists():
+            raise FileNotFoundError(f"Meta file not found: {meta_path}")
+        if not model_path.exists():
+            raise FileNotFoundError(f"Model file not found: {model_path}")
 
-    def __init__(self):
-        if getattr(self, "_loaded", False):
-            return
-        if not META_PATH.exists():
-            raise FileNotFoundError(f"Meta file not found: {META_PATH}")
-        if not MODEL_PATH.exists():
-            raise FileNotFoundError(f"Model file not found: {MODEL_PATH}")
+        self.version = version
+        self.model_dir = model_dir
+        self.cell_state_path = model_dir / CELL_STATE_FILE
 
-        with META_PATH.open("r", encoding="utf-8") as f:
+        with meta_path.open("r", encoding="utf-8") as f:
             meta = json.load(f)
 
         # 메타 정보
@@ -68,20 +147,33 @@ class LSTMForecastService:
         self.scaler_mean = np.array(meta.get("scaler_mean", [0.0] * self.input_dim), dtype=np.float32)
         self.scaler_scale = np.array(meta.get("scaler_scale", [1.0] * self.input_dim), dtype=np.float32)
         self.scaler_scale[self.scaler_scale == 0] = 1.0  # 0 division 보호
+        self.scaler_mean.setflags(write=False)
+        self.scaler_scale.setflags(write=False)
 
         # 출력 길이(메타에 없으면 헤드에서 유도)
         self.out_len: int = int(meta.get("out_len", 4))
 
         # 모델 로드
-        self.model = self._load_model()
+        self.model = self._load_model(model_path)
         self.model.eval()
-        self._loaded = True
+        for p in self.model.parameters():
+            p.requires_grad_(False)
+
+        # 셀별 LSTM 상태 캐시 (증분 예측). 버전/모델 파일이 바뀌면 무효화
+        stat_m, stat_w = meta_path.stat(), model_path.stat()
+        self.model_tag = f"{version}-{stat_w.st_size}-{stat_w.st_mtime_ns}-{stat_m.st_mtime_ns}"
+        self.refresh_every = FULL_REFRESH_EVERY or self.seq_len
+        self._cell_state: Optional[CellStateStore] = None
+        # cell_state.npz 의 mtime (없으면 None). 요청마다 stat 하지 않도록 번들 생성 시 1회 확인하고
+        # 이후에는 reload_cell_state_if_changed() (watch_active_version 주기) 에서만 다시 확인
+        self._cell_state_mtime: Optional[int] = self._stat_cell_state()
+        self.loaded_at = time.time()
 
-    def _load_model(self) -> nn.Module:
+    def _load_model(self, model_path: Path) -> nn.Module:
         # 1) state_dict 저장을 기본 가정
         try:
             model = LSTMWrapper(input_size=self.input_dim, out_len=self.out_len)
-            state = torch.load(str(MODEL_PATH), map_location="cpu")
+            state = torch.load(str(model_path), map_location="cpu")
             # 일부 학습 스크립트는 {"state_dict": ...} 형태로 저장
             if isinstance(state, dict) and "state_dict" in state:
                 state = state["state_dict"]
@@ -89,9 +181,19 @@ class LSTMForecastService:
             return model
         except Exception:
             # 2) 통짜 저장(torch.save(model))일 경우
-            model = torch.load(str(MODEL_PATH), map_location="cpu")
+            model = torch.load(str(model_path), map_location="cpu")
             return model
 
+    def warmup(self, batch: int = WARMUP_BATCH) -> None:
+        """교체 전에 실제 추론 경로를 한 번씩 실행 (첫 요청 지연 방지)"""
+        x = torch.zeros((max(1, batch), self.seq_len, self.input_dim), dtype=torch.float32)
+        with torch.no_grad():
+            self.model(x)
+            self.model(x[:1])
+            if self.supports_incremental:
+                _, state = self.model.forward_with_state(x)
+                self.model.forward_with_state(x[:, -1:, :], state)
+
     # ---------- 전처리 ----------
     def _to_matrix(self, rows: Sequence[Dict[str, float]]) -> np.ndarray:
         """
@@ -108,9 +210,11 @@ class LSTMForecastService:
         for t, row in enumerate(rows):
             mat[t] = np.array([float(row.get(col, 0.0)) for col in self.feature_order], dtype=np.float32)
 
-        # 표준화
-        mat = (mat - self.scaler_mean) / self.scaler_scale
-        return mat
+        return self._scale(mat)
+
+    def _scale(self, mat: np.ndarray) -> np.ndarray:
+        """표준화: (x-mean)/scale. 마지막 축이 feature_order 순서여야 함"""
+        return ((mat - self.scaler_mean) / self.scaler_scale).astype(np.float32, copy=False)
 
     # ---------- 예측 ----------
     def forecast(self, last_rows: Sequence[Dict[str, float]]) -> List[float]:
@@ -123,3 +227,226 @@ class LSTMForecastService:
         with torch.no_grad():
             y = self.model(x)                                  # (1, out_len)
         return y.squeeze(0).cpu().numpy().astype(float).tolist()
+
+    # ---------- 증분 예측 (셀별 상태 캐시) ----------
+    @property
+    def supports_incremental(self) -> bool:
+        return isinstance(self.model, LSTMWrapper)
+
+    def _stat_cell_state(self) -> Optional[int]:
+        try:
+            return self.cell_state_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load_cell_state(self) -> CellStateStore:
+        store = None
+        if self._cell_state_mtime is not None:
+            store = CellStateStore.load(self.cell_state_path, self.model_tag)
+        if store is None:
+            lstm = self.model.lstm
+            store = CellStateStore(lstm.num_layers, lstm.hidden_size, self.out_len, model_tag=self.model_tag)
+        return store
+
+    @property
+    def cell_state(self) -> CellStateStore:
+        """버전 디렉터리의 cell_state.npz 를 1회 로드 (없거나 모델이 바뀌었으면 빈 상태)"""
+        if self._cell_state is None:
+            self._cell_state = self._load_cell_state()
+        return self._cell_state
+
+    def reload_cell_state_if_changed(self) -> bool:
+        """
+        refresh_forecasts 가 cell_state.npz 를 다시 쓴 경우(mtime 변경) 새 상태로 교체
+        - 파일은 tmp+replace 로 원자적으로 바뀌므로 읽는 도중 반쯤 쓰인 파일을 볼 일은 없음
+        - 새 store 를 다 만든 뒤 참조만 바꾸므로 진행 중인 요청은 이전 store 로 끝까지 조회
+        """
+        mtime = self._stat_cell_state()
+        if mtime == self._cell_state_mtime:
+            return False
+        self._cell_state_mtime = mtime
+        if self.supports_incremental:
+            self._cell_state = self._load_cell_state()
+        return True
+
+    def advance(self, cell_ids: Sequence[str], windows: np.ndarray, week: int) -> np.ndarray:
+        """
+        주간 갱신: 셀마다 week 주차를 반영한 예측값을 계산
+        windows: (B, seq_len, F) 원본(스케일 전) feature, 마지막 행이 week 주차
+        - 직전 주차 상태가 있으면 1 step 만 진행, 없거나 refresh_every 에 도달하면 전체 윈도우 재계산
+        return: (B, out_len)
+        """
+        x = self._scale(np.asarray(windows, dtype=np.float32)[:, -self.seq_len:, :])
+        if not self.supports_incremental:
+            with torch.no_grad():
+                return self.model(torch.from_numpy(x)).cpu().numpy()
+        return advance_cells(self.model, self.cell_state, cell_ids, x, week, self.refresh_every)
+
+    def cached_forecast(self, cell_id: str, week: int) -> Optional[List[float]]:
+        """주간 갱신으로 계산해 둔 week 주차 예측값. 없으면 None"""
+        if self._cell_state is None and self._cell_state_mtime is None:
+            return None
+        store = self.cell_state
+        row = store.lookup(cell_id)
+        if row is None or store.week[row] != week:
+            return None
+        return store.preds[row].astype(float).tolist()
+
+    def save_cell_state(self) -> None:
+        if self._cell_state is not None:
+            self._cell_state.save(self.cell_state_path)
+            self._cell_state_mtime = self._stat_cell_state()
+
+
+class LSTMForecastService:
+    """
+    - model_meta.json 을 읽어 feature 순서/스케일러/seq_len을 적용
+    - best_lstm.pt 로드를 싱글톤처럼 1회만 수행
+    - 입력: 최근 seq_len 기간의 feature 시계열 (딕셔너리 리스트)
+    - 출력: 예측값 벡터(list[float])
+    - 무중단 교체: 새 버전을 백그라운드에서 로드·워밍업한 뒤 active 포인터만 바꿈 (read-copy-update)
+      요청 처리 중에는 `model = lstm.active` 로 번들을 한 번 잡아 끝까지 사용하면
+      교체 도중에도 진행 중인 추론은 이전 버전으로 끝까지 실행된다
+    """
+    _instance: Optional["LSTMForecastService"] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._loaded = False
+        return cls._instance
+
+    def __init__(self):
+        if getattr(self, "_loaded", False):
+            return
+        version = read_active_version()
+        self._active = ModelBundle(version, version_dir(version))
+        self._swap_lock = threading.Lock()
+        self.swapping: Optional[str] = None
+        self._loaded = True
+
+    @property
+    def active(self) -> ModelBundle:
+        return self._active
+
+    # ---------- 현재 버전 위임 ----------
+    @property
+    def version(self) -> str:
+        return self._active.version
+
+    @property
+    def seq_len(self) -> int:
+        return self._active.seq_len
+
+    @property
+    def input_dim(self) -> int:
+        return self._active.input_dim
+
+    @property
+    def out_len(self) -> int:
+        return self._active.out_len
+
+    @property
+    def feature_order(self) -> List[str]:
+        return self._active.feature_order
+
+    @property
+    def model(self) -> nn.Module:
+        return self._active.model
+
+    @property
+    def supports_incremental(self) -> bool:
+        return self._active.supports_incremental
+
+    @property
+    def cell_state(self) -> CellStateStore:
+        return self._active.cell_state
+
+    def forecast(self, last_rows: Sequence[Dict[str, float]]) -> List[float]:
+        return self._active.forecast(last_rows)
+
+    def advance(self, cell_ids: Sequence[str], windows: np.ndarray, week: int) -> np.ndarray:
+        return self._active.advance(cell_ids, windows, week)
+
+    def cached_forecast(self, cell_id: str, week: int) -> Optional[List[float]]:
+        return self._active.cached_forecast(cell_id, week)
+
+    def save_cell_state(self) -> None:
+        self._active.save_cell_state()
+
+    # ---------- 무중단 교체 ----------
+    def swap(self, version: str, write_pointer: bool = True) -> Dict[str, Any]:
+        """
+        version 을 로드·워밍업한 뒤 active 로 교체 (블로킹, 스레드에서 호출)
+        write_pointer=True 면 ACTIVE 파일도 갱신 → 다른 워커 프로세스가 watch_active_version 으로 따라옴
+        MODEL_VERSION 으로 고정된 경우 다른 버전으로는 교체 불가 (ModelVersionPinned)
+        """
+        pinned = pinned_version()
+        if pinned and version != pinned:
+            raise ModelVersionPinned(f"model version is pinned to {pinned} by MODEL_VERSION")
+        if not self._swap_lock.acquire(blocking=False):
+            raise ModelSwapInProgress(f"swap to {self.swapping} already in progress")
+        try:
+            previous = self._active
+            if version == previous.version:
+                return {"previous": previous.version, "active": version, "swapped": False}
+            self.swapping = version
+            t0 = time.perf_counter()
+            bundle = ModelBundle(version, version_dir(version))
+            t1 = time.perf_counter()
+            bundle.warmup()
+            if bundle.supports_incremental:
+                bundle.cell_state  # 새 버전 예측 캐시도 미리 로드
+            t2 = time.perf_counter()
+
+            if write_pointer:
+                # ACTIVE 를 먼저 기록: 실패하면(읽기 전용 MODEL_DIR, 디스크 부족 등) 교체하지 않음
+                # → 이 워커만 새 버전이 되었다가 watch_active_version 이 되돌리는 상황 방지
+                write_active_version(version)
+            self._active = bundle  # 포인터 교체 (원자적)
+            log.info("model swapped %s -> %s (load %.2fs, warmup %.2fs)",
+                     previous.version, version, t1 - t0, t2 - t1)
+            return {"previous": previous.version, "active": version, "swapped": True,
+                    "load_s": round(t1 - t0, 3), "warmup_s": round(t2 - t1, 3)}
+        finally:
+            self.swapping = None
+            self._swap_lock.release()
+
+    def sync_active_version(self) -> Optional[Dict[str, Any]]:
+        """ACTIVE 파일이 다른 버전을 가리키면(다른 워커가 교체) 이 프로세스도 교체"""
+        version = read_active_version()
+        if version == self._active.version or self.swapping is not None:
+            return None
+        return self.swap(version, write_pointer=False)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "active_version": self._active.version,
+            "loaded_at": self._active.loaded_at,
+            "swapping": self.swapping,
+            "pinned": pinned_version(),
+            "versions": list_versions(),
+            "pid": os.getpid(),
+        }
+
+
+async def watch_active_version(interval: float = WATCH_INTERVAL_S) -> None:
+    """
+    워커 프로세스마다 실행
+    - ACTIVE 파일을 주기적으로 확인해 다른 워커의 교체를 따라감
+    - 주간 갱신(refresh_forecasts)이 cell_state.npz 를 다시 쓰면 예측 캐시도 다시 로드
+    """
+    svc = LSTMForecastService()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(svc.sync_active_version)
+        except ModelSwapInProgress:
+            pass
+        except Exception:
+            log.exception("model version sync failed")
+        try:
+            if await asyncio.to_thread(svc.active.reload_cell_state_if_changed):
+                log.info("cell state reloaded for model %s", svc.version)
+        except Exception:
+            log.exception("cell state reload failed")
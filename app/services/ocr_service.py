@@ -1,15 +1,16 @@
 # backend/app/services/ocr_service.py
-import requests
+import httpx
 import json
 from fastapi import HTTPException
 from ..core.config import settings
+from .upstream_scheduler import scheduler, retry_after_seconds, UpstreamOverloaded
 
 class OcrService:
     def __init__(self):
         self.api_url = settings.NAVER_OCR_API_URL
         self.secret_key = settings.NAVER_OCR_SECRET_KEY
 
-    def process_receipt_image(self, file_content: bytes) -> str:
+    async def process_receipt_image(self, file_content: bytes) -> str:
         """Naver Clova OCR API를 호출하여 영수증 텍스트를 추출합니다."""
         headers = {'X-OCR-SECRET': self.secret_key}
         
@@ -23,7 +24,13 @@ class OcrService:
         }
         
         try:
-            response = requests.post(self.api_url, headers=headers, data={'message': json.dumps(request_data)}, files=files)
+            async with scheduler.limit("clova") as limiter:
+                async with httpx.AsyncClient(timeout=30.0) as client:
+                    response = await client.post(self.api_url, headers=headers, data={'message': json.dumps(request_data)}, files=files)
+            if response.status_code == 429:
+                retry_after = retry_after_seconds(response.headers)
+                limiter.throttle(retry_after)
+                raise UpstreamOverloaded(limiter.name, "upstream 429", retry_after)
             response.raise_for_status()
             
             ocr_result = response.json()
@@ -36,7 +43,7 @@ class OcrService:
             
             return extracted_text
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise HTTPException(status_code=500, detail=f"OCR API 호출 실패: {e}")
 
     def authenticate_receipt(self, extracted_text: str, known_stores: list[str]) -> bool:
@@ -6,9 +6,12 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 import google.generativeai as genai
+from google.api_core import exceptions as gexc
 from pydantic import ValidationError
 from fastapi import HTTPException
+from app.core.config import settings
 from app.schemas.recommendation_schema import RecommendationPayload
+from app.services.upstream_scheduler import scheduler, retry_after_seconds, Priority, UpstreamOverloaded
 
 # --- 환경 변수 ---
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
@@ -16,6 +19,7 @@ GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
 PROVIDER_PLACES = os.getenv("PROVIDER_PLACES", "mock").lower()
 KAKAO_REST_API_KEY = os.getenv("KAKAO_REST_API_KEY", "")
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY", "")
+GEMINI_THROTTLE_S = settings.GEMINI_THROTTLE_S
 
 if not GEMINI_API_KEY:
     # FastAPI 시작 시점의 오류가 아니라, 함수 호출 시점의 오류로 처리
@@ -49,6 +53,23 @@ def extract_json_block(text: str) -> dict:
         return json.loads(cleaned)
 
 # --- Providers ---
+def _raise_for_status(r: httpx.Response, limiter) -> None:
+    """upstream 429 는 스케줄러에 알려 잠시 호출을 멈추고 503 으로 변환"""
+    if r.status_code == 429:
+        retry_after = retry_after_seconds(r.headers)
+        limiter.throttle(retry_after)
+        raise UpstreamOverloaded(limiter.name, "upstream 429", retry_after)
+    r.raise_for_status()
+
+async def generate_gemini(gmodel, prompt: str, priority: Priority = Priority.INTERACTIVE, **kwargs):
+    """Gemini 호출을 스케줄러로 제한하고, 429(ResourceExhausted)는 잠시 호출을 멈춘 뒤 503 으로 변환"""
+    async with scheduler.limit("gemini", priority) as limiter:
+        try:
+            return await gmodel.generate_content_async(prompt, **kwargs)
+        except gexc.ResourceExhausted:
+            limiter.throttle(GEMINI_THROTTLE_S)
+            raise UpstreamOverloaded(limiter.name, "upstream 429", GEMINI_THROTTLE_S)
+
 def _haversine_m(lat1, lon1, lat2, lon2):
     R = 6371000
     phi1, phi2 = math.radians(lat1), math.radians(lat2)
@@ -95,8 +116,9 @@ async def _kakao_places(category: str, lat: float, lng: float, radius_m: int) ->
             params = {"query": keyword, "x": str(lng), "y": str(lat),
                       "radius": str(min(max(radius_m,100),20000)),
                       "page": page, "size": 15, "sort": "distance"}
-            r = await s.get(url, headers=headers, params=params)
-            r.raise_for_status()
+            async with scheduler.limit("kakao") as limiter:
+                r = await s.get(url, headers=headers, params=params)
+            _raise_for_status(r, limiter)
             data = r.json()
             for d in data.get("documents", []):
                 items.append({
@@ -126,8 +148,9 @@ async def _openweather(lat: float, lng: float) -> Dict[str, Any]:
     url = "https://api.openweathermap.org/data/2.5/weather"
     params = {"lat":lat, "lon":lng, "appid":OPENWEATHER_API_KEY, "units":"metric"}
     async with httpx.AsyncClient(timeout=8.0) as s:
-        r = await s.get(url, params=params)
-        r.raise_for_status()
+        async with scheduler.limit("openweather") as limiter:
+            r = await s.get(url, params=params)
+        _raise_for_status(r, limiter)
         data = r.json()
     wx = data.get("weather", [{}])[0].get("main", "Clouds").lower()
     temp = data.get("main", {}).get("temp", None)
@@ -158,7 +181,8 @@ async def call_gemini_json(user_profile: dict, context: dict, candidates: list,
         weather=json.dumps(weather, ensure_ascii=False),
     )
     
-    resp = model.generate_content(
+    resp = await generate_gemini(
+        model,
         content,
         generation_config={
             "temperature": 0.15,
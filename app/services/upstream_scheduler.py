@@ -0,0 +1,284 @@
+# app/services/upstream_scheduler.py
+"""
+외부 API(Kakao, OpenWeather, Gemini, Clova OCR) 호출 스케줄러
+- upstream 별 토큰 버킷(초당 호출 수) + 동시 호출 상한
+- 우선순위: INTERACTIVE(/recommend 등 사용자 요청) > BACKGROUND(캠페인/홍보 생성)
+- 대기열은 크기 제한이 있고, 예상 대기시간이 요청 마감(deadline)을 넘으면 즉시 거절(load shedding)
+- 거절은 503 + Retry-After 로 응답 (upstream 429 가 500 으로 번지지 않도록)
+- 한도는 프로세스 단위 → pre-fork 워커 N개면 실제 한도는 N배 (settings.UPSTREAM_* 로 나눠서 설정)
+
+사용 예)
+    async with scheduler.limit("kakao"):
+        r = await client.get(...)
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from fastapi import HTTPException
+
+from ..core.config import settings
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class UpstreamOverloaded(HTTPException):
+    """대기열 포화/마감 초과로 upstream 호출을 거절할 때 사용 (503)"""
+    def __init__(self, upstream: str, reason: str, retry_after: float = 1.0):
+        super().__init__(
+            status_code=503,
+            detail=f"{upstream} 호출량 초과로 요청을 처리할 수 없습니다 ({reason})",
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+        )
+        self.upstream = upstream
+        self.reason = reason
+
+
+@dataclass
+class UpstreamPolicy:
+    rate: float              # 초당 허용 호출 수 (토큰 충전 속도)
+    burst: int               # 토큰 버킷 크기
+    max_concurrency: int     # 동시 호출 상한
+    max_queue: int           # 대기열 길이 상한
+    timeout: float           # deadline 이 없을 때 최대 대기시간(초)
+
+
+def _policy_from_settings(name: str, default: UpstreamPolicy) -> UpstreamPolicy:
+    """settings.UPSTREAM_<NAME>_{RPS,BURST,CONCURRENCY,QUEUE,TIMEOUT} 가 있으면 덮어쓰기 (환경 변수/.env)"""
+    key = f"UPSTREAM_{name.upper()}_"
+
+    def pick(suffix: str, value):
+        override = getattr(settings, key + suffix, None)
+        return value if override is None else type(value)(override)
+
+    return UpstreamPolicy(
+        rate=pick("RPS", default.rate),
+        burst=pick("BURST", default.burst),
+        max_concurrency=pick("CONCURRENCY", default.max_concurrency),
+        max_queue=pick("QUEUE", default.max_queue),
+        timeout=pick("TIMEOUT", default.timeout),
+    )
+
+
+DEFAULT_POLICIES: Dict[str, UpstreamPolicy] = {
+    "kakao": UpstreamPolicy(rate=20.0, burst=20, max_concurrency=16, max_queue=200, timeout=5.0),
+    "openweather": UpstreamPolicy(rate=10.0, burst=10, max_concurrency=8, max_queue=200, timeout=5.0),
+    "gemini": UpstreamPolicy(rate=5.0, burst=5, max_concurrency=8, max_queue=100, timeout=20.0),
+    "clova": UpstreamPolicy(rate=2.0, burst=2, max_concurrency=4, max_queue=50, timeout=15.0),
+}
+
+
+# ---------- 요청 마감(deadline) ----------
+_deadline: ContextVar[Optional[float]] = ContextVar("upstream_deadline", default=None)
+
+
+@contextmanager
+def request_deadline(seconds: float) -> Iterator[float]:
+    """현재 요청의 마감 시각(time.monotonic 기준)을 설정. 중첩 시 더 이른 값을 유지"""
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "future")
+
+    def __init__(self, priority: int, seq: int, future: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.future = future
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class UpstreamLimiter:
+    """upstream 하나에 대한 토큰 버킷 + 동시성 제한 + 우선순위 대기열"""
+
+    def __init__(self, name: str, policy: UpstreamPolicy):
+        self.name = name
+        self.policy = policy
+        self._tokens = float(policy.burst)
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._in_flight = 0
+        self._heap: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._latency_ewma = 1.0 / max(policy.rate, 1e-6)
+        # 지표
+        self.admitted = 0
+        self.shed: Dict[str, int] = {"queue_full": 0, "deadline": 0, "timeout": 0}
+        self.throttled = 0
+
+    # ---------- 토큰 버킷 ----------
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        if elapsed > 0:
+            self._tokens = min(float(self.policy.burst), self._tokens + elapsed * self.policy.rate)
+            self._refilled_at = now
+
+    def _queued_ahead(self, priority: int) -> int:
+        return sum(1 for w in self._heap if w.priority <= priority and not w.future.done())
+
+    def estimate_wait(self, priority: int, now: Optional[float] = None) -> float:
+        """대기열 앞쪽 요청 수와 토큰/동시성 여유로부터 예상 대기시간(초) 추정"""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        ahead = self._queued_ahead(priority) + 1
+        token_wait = max(0.0, ahead - self._tokens) / max(self.policy.rate, 1e-6)
+        busy = self._in_flight + ahead - self.policy.max_concurrency
+        conc_wait = max(0, busy) / self.policy.max_concurrency * self._latency_ewma
+        return max(token_wait, conc_wait, self._blocked_until - now)
+
+    # ---------- 획득/반납 ----------
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE, deadline: Optional[float] = None) -> None:
+        now = time.monotonic()
+        limit = now + self.policy.timeout
+        deadline = limit if deadline is None else min(deadline, limit)
+
+        if len(self._heap) >= self.policy.max_queue:
+            self.shed["queue_full"] += 1
+            raise UpstreamOverloaded(self.name, "queue full", self.estimate_wait(priority, now))
+        wait = self.estimate_wait(priority, now)
+        if now + wait > deadline:
+            self.shed["deadline"] += 1
+            raise UpstreamOverloaded(self.name, "deadline", wait)
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, _Waiter(int(priority), next(self._seq), fut))
+        self._pump()
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), timeout=max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            if fut.done() and not fut.cancelled():
+                # 타임아웃 직전에 슬롯이 배정됨 → 그대로 사용
+                return
+            fut.cancel()
+            self._compact()
+            self.shed["timeout"] += 1
+            self._pump()
+            raise UpstreamOverloaded(self.name, "timeout", self.estimate_wait(priority))
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release(0.0)
+            else:
+                fut.cancel()
+                self._compact()
+                self._pump()
+            raise
+
+    def release(self, elapsed: float) -> None:
+        self._in_flight -= 1
+        if elapsed > 0:
+            self._latency_ewma = 0.8 * self._latency_ewma + 0.2 * elapsed
+        self._pump()
+
+    def throttle(self, retry_after: float) -> None:
+        """upstream 이 429 를 돌려주면 retry_after 동안 새 호출을 보내지 않음"""
+        self.throttled += 1
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        self._tokens = min(self._tokens, 0.0)
+
+    def _compact(self) -> None:
+        """타임아웃/취소된 대기자를 즉시 제거 (맨 앞이 아니어도 queue_full 판정에 잡히지 않도록)"""
+        self._heap = [w for w in self._heap if not w.future.done()]
+        heapq.heapify(self._heap)
+
+    def _pump(self) -> None:
+        """대기열 맨 앞부터 토큰/동시성 여유가 있는 만큼 슬롯 배정"""
+        now = time.monotonic()
+        self._refill(now)
+        while self._heap:
+            head = self._heap[0]
+            if head.future.done():
+                heapq.heappop(self._heap)
+                continue
+            if self._in_flight >= self.policy.max_concurrency:
+                return  # release() 에서 다시 호출됨
+            if now < self._blocked_until or self._tokens < 1.0:
+                delay = max(self._blocked_until - now, (1.0 - self._tokens) / max(self.policy.rate, 1e-6))
+                self._schedule(delay)
+                return
+            heapq.heappop(self._heap)
+            self._tokens -= 1.0
+            self._in_flight += 1
+            self.admitted += 1
+            head.future.set_result(None)
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer is not None and not self._timer.cancelled():
+            return
+        loop = asyncio.get_running_loop()
+
+        def fire():
+            self._timer = None
+            self._pump()
+
+        self._timer = loop.call_later(max(delay, 0.001), fire)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._refill(now)
+        return {
+            "queue_depth": sum(1 for w in self._heap if not w.future.done()),
+            "in_flight": self._in_flight,
+            "tokens": round(self._tokens, 2),
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "throttled": self.throttled,
+            "blocked_for_s": round(max(0.0, self._blocked_until - now), 2),
+            "latency_ewma_s": round(self._latency_ewma, 3),
+        }
+
+
+class UpstreamScheduler:
+    def __init__(self, policies: Dict[str, UpstreamPolicy]):
+        self.limiters: Dict[str, UpstreamLimiter] = {
+            name: UpstreamLimiter(name, policy) for name, policy in policies.items()
+        }
+
+    @classmethod
+    def from_settings(cls) -> "UpstreamScheduler":
+        return cls({name: _policy_from_settings(name, p) for name, p in DEFAULT_POLICIES.items()})
+
+    @asynccontextmanager
+    async def limit(self, upstream: str, priority: Priority = Priority.INTERACTIVE) -> AsyncIterator[UpstreamLimiter]:
+        limiter = self.limiters[upstream]
+        await limiter.acquire(priority, _deadline.get())
+        started = time.monotonic()
+        try:
+            yield limiter
+        finally:
+            limiter.release(time.monotonic() - started)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
+
+
+def retry_after_seconds(headers: Any, default: float = 1.0) -> float:
+    """응답 헤더의 Retry-After(초) 값을 읽음. 없거나 형식이 다르면 default"""
+    try:
+        return float(headers.get("Retry-After", default))
+    except (TypeError, ValueError):
+        return default
+
+
+scheduler = UpstreamScheduler.from_settings()
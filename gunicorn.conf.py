@@ -0,0 +1,36 @@
+# gunicorn.conf.py
+# 운영 서빙: gunicorn 마스터가 앱(모델/격자 데이터)을 먼저 로드한 뒤 워커를 fork
+#   gunicorn -c gunicorn.conf.py app.main:app
+import os
+import sys
+
+# `gunicorn` 스크립트로 실행하면 작업 디렉터리가 sys.path 에 없을 수 있음
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings  # noqa: E402 (torch 를 import 하지 않음)
+
+# torch/OpenMP 가 import 되기 전에 스레드 수를 제한해야 마스터에도 적용됨
+os.environ.setdefault("OMP_NUM_THREADS", str(settings.TORCH_NUM_THREADS))
+os.environ.setdefault("MKL_NUM_THREADS", str(settings.TORCH_NUM_THREADS))
+
+bind = os.getenv("BIND", f"{os.getenv('FASTAPI_HOST', '0.0.0.0')}:{os.getenv('FASTAPI_PORT', '8000')}")
+workers = settings.WEB_CONCURRENCY
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+
+
+def when_ready(server):
+    # preload_app=True 이므로 이 시점에 app.main 이 이미 import 되어 있음
+    from app.core.serving import preload_shared_state
+
+    preload_shared_state()
+    server.log.info("shared model/grid state preloaded; forking %s workers", workers)
+
+
+def post_fork(server, worker):
+    from app.core.serving import configure_worker_threads
+
+    configure_worker_threads()